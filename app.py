@@ -1,416 +1,327 @@
+import time
+_script_start = time.perf_counter()
+import importlib
+import os
+import sys
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from indic_transliteration import sanscript
-from indic_transliteration.sanscript import transliterate
-import re
+from chakra_engine import scheme_map, chakra_colors, chakras, cached_analysis, cache_stats
+from chakra_bundle import reference_bundle, chakra_deva_cards
+import chakra_metrics
+from chakra_metrics import timed, trace
+_imports_done = time.perf_counter()
+# Fast-start mode renders only the selected section instead of every tab
+fast_start = os.environ.get('CHAKRA_FAST_START', '') not in ('', '0')
 
-# Preprocess function for English mode
-def preprocess_input(name_input):
-    vowel_map = {'A': 'aa', 'E': 'ee', 'I': 'ii', 'O': 'oo', 'U': 'uu'}
-    processed = ''
-    for char in name_input:
-        if char in vowel_map:
-            processed += vowel_map[char]
+# Startup timings (module imports, first render) collected once per process
+@st.cache_resource
+def startup_metrics():
+    return {}
+
+# Record a startup timing and report it in the server log
+def record_startup_timing(key, seconds):
+    startup_metrics()[key] = seconds
+    print(f"Startup timing: {key}={seconds * 1000:.1f}ms", file=sys.stderr)
+
+# Import a heavy module on first use, recording how long the import took
+def lazy_import(name):
+    if name not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        record_startup_timing(f"import {name}", time.perf_counter() - start)
+    return sys.modules[name]
+
+# Chakra distribution chart, cached per distinct set of counts
+@st.cache_resource(max_entries=1024)
+def chakra_figure(chakra_counts, vowel_count):
+    pd = lazy_import('pandas')
+    px = lazy_import('plotly.express')
+    chakra_df = pd.DataFrame(list(chakra_counts), columns=['Chakra', 'Frequency'])
+    if vowel_count > 0:
+        chakra_df.loc[len(chakra_df)] = ['Vishuddha (Vowels)', vowel_count]
+    return px.bar(chakra_df, x='Chakra', y='Frequency', title='Chakra Distribution in Name', color='Chakra', color_discrete_map=chakra_colors)
+
+# Render an analysis result: prose, associated Devas and chakra distribution chart
+def render_analysis(result):
+    st.markdown(result['prose'])
+
+    # Display associated Devas
+    dominant_chakra = result['dominant_chakra']
+    if dominant_chakra:
+        st.subheader("Associated Vedic Devas")
+        with timed('deva_lookup'):
+            deva_cards = chakra_deva_cards(dominant_chakra)
+        if deva_cards:
+            for label, card in deva_cards:
+                with st.expander(label):
+                    st.markdown(card)
         else:
-            processed += char.lower()
-    return processed
+            st.write("No specific Devas are directly associated with this chakra.")
 
-# Parser function to extract base consonants and vowels from ITRANS string
-def extract_phonemes(itrans_name):
-    base_consonants = ['kSh', 'Ng', 'Nj', 'Ch', 'Th', 'Dh', 'Sh', 'kh', 'gh', 'ch', 'jh', 'Th', 'Dh', 'ph', 'bh', 'sh', 'ph', 'bh', 'k', 'g', 'c', 'j', 'T', 'D', 't', 'd', 'p', 'b', 'm', 'y', 'r', 'l', 'v', 's', 'h', 'N']
-    vowels_list = ['RRi', 'RRI', 'LLi', 'LLI', 'AI', 'AU', 'A', 'I', 'U', 'E', 'O', 'a', 'i', 'u', 'e', 'ai', 'au', 'o', 'M', 'H']
-    consonants_found = []
-    vowels_found = []
-    i = 0
-    while i < len(itrans_name):
-        matched = False
-        # Match longest consonant first
-        for clen in range(3, 0, -1):  # Max length like 'kSh' = 3
-            if i + clen <= len(itrans_name):
-                sub = itrans_name[i:i + clen]
-                if sub in base_consonants:
-                    consonants_found.append(sub)
-                    i += clen
-                    matched = True
-                    break
-        if matched:
-            # Check for following vowel (matra)
-            vmatched = False
-            for vlen in range(4, 0, -1):  # Max length like 'RRi' = 3
-                if i + vlen <= len(itrans_name):
-                    sub = itrans_name[i:i + vlen]
-                    if sub in vowels_list:
-                        vowels_found.append(sub)
-                        i += vlen
-                        vmatched = True
-                        break
-            if not vmatched:
-                # Implicit 'a' if no vowel, but don't add to vowels (since not explicit)
-                pass
-            continue
-        # If no consonant, match vowel
-        for vlen in range(4, 0, -1):
-            if i + vlen <= len(itrans_name):
-                sub = itrans_name[i:i + vlen]
-                if sub in vowels_list:
-                    vowels_found.append(sub)
-                    i += vlen
-                    matched = True
-                    break
-        if not matched:
-            i += 1  # Skip invalid chars
-    return consonants_found, vowels_found
+    # Bar chart for chakra distribution
+    st.subheader("Chakra Distribution")
+    with timed('chart_build'):
+        fig = chakra_figure(tuple(result['chakra_counts'].items()), result['vowel_count'])
+    with timed('chart_render'):
+        st.plotly_chart(fig, use_container_width=True)
+# After a failed analysis, suggest the options auto-detection would have used instead
+def suggest_options(name_input, scheme, english_mode):
+    detected = lazy_import('chakra_detect').detect_scheme(name_input)
+    if detected['devanagari']:
+        st.info("This looks like Devanagari: choose the Devanagari input method.")
+    elif detected['score'] > 0 and (detected['scheme'], detected['english_mode']) != (scheme, english_mode):
+        english = " with 'Treat as English Name' checked" if detected['english_mode'] else ""
+        st.info(f"Try the {detected['scheme']} scheme{english}, or check 'Auto-detect scheme and English mode'.")
 
-# Transliteration scheme mapping
-scheme_map = {
-    "ITRANS": sanscript.ITRANS,
-    "Harvard-Kyoto": sanscript.HK,
-    "SLP1": sanscript.SLP1,
-    "Velthuis": sanscript.VELTHUIS,
-    "WX": sanscript.WX
-}
-# Chakra mappings based on ITRANS transliterated consonants
-chakra_mappings = {
-    'ka': 'Anahata', 'kha': 'Anahata', 'ga': 'Anahata', 'gha': 'Anahata', 'Nga': 'Anahata',
-    'cha': 'Anahata', 'Cha': 'Anahata', 'ja': 'Anahata', 'jha': 'Anahata', 'Nja': 'Anahata',
-    'Ta': 'Anahata', 'Tha': 'Anahata',
-    'Da': 'Manipura', 'Dha': 'Manipura', 'Na': 'Manipura', 'ta': 'Manipura', 'tha': 'Manipura',
-    'da': 'Manipura', 'dha': 'Manipura', 'na': 'Manipura', 'pa': 'Manipura', 'pha': 'Manipura',
-    'ba': 'Svadhisthana', 'bha': 'Svadhisthana', 'ma': 'Svadhisthana', 'ya': 'Svadhisthana',
-    'ra': 'Svadhisthana', 'la': 'Svadhisthana',
-    'va': 'Muladhara', 'sha': 'Muladhara', 'Sha': 'Muladhara', 'sa': 'Muladhara',
-    'ha': 'Ajna', 'kSha': 'Ajna'
-}
-# Vowels for Vishuddha chakra in ITRANS
-vowels = ['a', 'aa', 'i', 'ii', 'u', 'uu', 'RRi', 'RRI', 'LLi', 'LLI', 'e', 'ai', 'o', 'au', 'aM', 'aH']
-# Bhava and Rasa mappings
-bhava_rasa_mappings = {
-    'Muladhara': {'bhava': 'Bhaya (Fear)', 'rasa': 'Bhayanaka (Fearful)', 'bhava_emoji': '😨', 'rasa_emoji': '😨', 'description': 'resonates with grounding and survival, evoking caution and alertness', 'emoji': '🔴', 'element': 'Earth'},
-    'Svadhisthana': {'bhava': 'Rati (Love)', 'rasa': 'Shringara (Romantic)', 'bhava_emoji': '❤️', 'rasa_emoji': '❤️', 'description': 'flows with creativity and passion, igniting love and beauty', 'emoji': '🧡', 'element': 'Water'},
-    'Manipura': {'bhava': 'Utsaha (Energy)', 'rasa': 'Veera (Heroic)', 'bhava_emoji': '💪', 'rasa_emoji': '💪', 'description': 'radiates confidence and power, inspiring courage and heroism', 'emoji': '🟡', 'element': 'Fire'},
-    'Anahata': {'bhava': 'Rati (Love)', 'rasa': 'Shringara (Compassionate)', 'bhava_emoji': '❤️', 'rasa_emoji': '❤️', 'description': 'pulses with love and empathy, fostering deep connections', 'emoji': '💚', 'element': 'Air'},
-    'Vishuddha': {'bhava': 'Hasya (Mirth)', 'rasa': 'Hasya (Comic)', 'bhava_emoji': '😂', 'rasa_emoji': '😂', 'description': 'vibrates with expression and joy, sparking laughter and communication', 'emoji': '🟦', 'element': 'Ether'},
-    'Ajna': {'bhava': 'Vismaya (Astonishment)', 'rasa': 'Adbhuta (Wonder)', 'bhava_emoji': '😲', 'rasa_emoji': '😲', 'description': 'illuminates intuition and insight, evoking wonder and awe', 'emoji': '🟣', 'element': 'Light'}
-}
-# Chakra colors
-chakra_colors = {
-    'Muladhara': 'red',
-    'Svadhisthana': 'orange',
-    'Manipura': 'yellow',
-    'Anahata': 'green',
-    'Vishuddha': 'blue',
-    'Ajna': 'indigo',
-    'Vishuddha (Vowels)': 'blue'
-}
-# Deva dataset
-deva_data = [
-    {"Deva": "🌊 Varuṇa", "Type": "☀️ Āditya", "Chakra": "🟦 Viśuddha", "Element": "💧 Water", "Vāhana": "🐊 Makara", "Bīja": "🕉️ Om Vam Varuṇāya Namaḥ", "Description": "Guardian of cosmic order, ruling the vast oceans with truth", "Vahana_Symbolism": "Symbolizes mastery over water and emotions"},
-    {"Deva": "🌞 Mitra", "Type": "☀️ Āditya", "Chakra": "💚 Anāhata", "Element": "🔆 Solar", "Vāhana": "🐎 Horse", "Bīja": "-", "Description": "Embodiment of friendship and harmony, shining with solar warmth", "Vahana_Symbolism": "Represents speed, freedom, and nobility"},
-    {"Deva": "🛡️ Āryaman", "Type": "☀️ Āditya", "Chakra": "🟡 Maṇipūra", "Element": "🌞 Solar Dignity", "Vāhana": "-", "Bīja": "-", "Description": "Upholder of honor and nobility, radiating dignified energy", "Vahana_Symbolism": "No specific Vahana"},
-    {"Deva": "💰 Bhaga", "Type": "☀️ Āditya", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "🪙 Abundance", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Bhagāya Namaḥ", "Description": "Bestower of prosperity, symbolizing wealth and strength", "Vahana_Symbolism": "Symbolizes strength and courage"},
-    {"Deva": "🌗 Aṃśa", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "🥛 Soma-share", "Vāhana": "-", "Bīja": "-", "Description": "Distributor of divine nectar, fostering spiritual insight", "Vahana_Symbolism": "No specific Vahana"},
-    {"Deva": "🛠️ Tvaṣṭṛ", "Type": "☀️ Āditya", "Chakra": "🔴 Mūlādhāra", "Element": "🧱 Creation", "Vāhana": "🐘 Elephant", "Bīja": "🕉️ Om Tvaṣṭre Namaḥ", "Description": "Divine craftsman, shaping creation with grounded wisdom", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
-    {"Deva": "☀️ Savitṛ", "Type": "☀️ Āditya", "Chakra": "⚪ Sahasrāra", "Element": "🌅 Solar Radiance", "Vāhana": "🌟 Golden Chariot", "Bīja": "🕉️ Tat Savitur Vareṇyam...", "Description": "Inspirer of enlightenment, radiating divine light", "Vahana_Symbolism": "Symbolizes the journey toward enlightenment"},
-    {"Deva": "🧭 Pūṣan", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "🛤️ Guidance", "Vāhana": "🐐 Goat", "Bīja": "🕉️ Om Pūṣṇe Namaḥ", "Description": "Guide of travelers, illuminating paths with intuition", "Vahana_Symbolism": "Represents sure-footedness and guidance"},
-    {"Deva": "📏 Dakṣa", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "📐 Order", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Dakṣāya Namaḥ", "Description": "Master of cosmic order, ensuring balance and clarity", "Vahana_Symbolism": "Symbolizes strength and courage"},
-    {"Deva": "☀️ Vivasvān", "Type": "☀️ Āditya", "Chakra": "⚪ Sahasrāra", "Element": "🔆 Light", "Vāhana": "🐎 Seven-Horse Chariot", "Bīja": "🕉️ Om Sūryāya Namaḥ", "Description": "Source of universal light, driving spiritual awakening", "Vahana_Symbolism": "Represents life-giving energy and movement"},
-    {"Deva": "⚡ Indra", "Type": "☀️ Āditya", "Chakra": "🟡 Maṇipūra", "Element": "🔥 Energy", "Vāhana": "🐘 Airāvata", "Bīja": "🕉️ Om Indrāya Namaḥ", "Description": "King of gods, wielding thunderous energy and courage", "Vahana_Symbolism": "Represents wisdom, power, and royalty"},
-    {"Deva": "🛡️ Viṣṇu", "Type": "☀️ Āditya", "Chakra": "🌈 All", "Element": "🛡️ Preserver", "Vāhana": "🦅 Garuḍa", "Bīja": "🕉️ Om Namo Nārāyaṇāya", "Description": "Preserver of the universe, harmonizing all energies", "Vahana_Symbolism": "Symbolizes speed and martial prowess"},
-    {"Deva": "🔱 Śiva", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "🌀 Destruction/Transformation", "Vāhana": "🐂 Bull (Nandi)", "Bīja": "🕉️ Om Namaḥ Śivāya", "Description": "Transformer of existence, guiding profound change", "Vahana_Symbolism": "Represents strength, fertility, and dharma"},
-    {"Deva": "🔥 Manyu", "Type": "🌪️ Rudra", "Chakra": "🟡 Maṇipūra", "Element": "😠 Anger", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Manyave Namaḥ", "Description": "Embodiment of fierce resolve, channeling intense energy", "Vahana_Symbolism": "Symbolizes strength and courage"},
-    {"Deva": "🐯 Ugra", "Type": "🌪️ Rudra", "Chakra": "🔴 Mūlādhāra", "Element": "💪 Fierce Will", "Vāhana": "🐅 Tiger", "Bīja": "🕉️ Om Ugrāya Namaḥ", "Description": "Fierce warrior, grounding strength with determination", "Vahana_Symbolism": "Represents ferocity and power"},
-    {"Deva": "📣 Bhīma", "Type": "🌪️ Rudra", "Chakra": "🟦 Viśuddha", "Element": "📢 Roar", "Vāhana": "🐘 Elephant", "Bīja": "-", "Description": "Resonator of mighty voice, amplifying expression", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
-    {"Deva": "🌀 Kapardī", "Type": "🌪️ Rudra", "Chakra": "⚪ Sahasrāra", "Element": "🔥 Tapas", "Vāhana": "🐂 Bull", "Bīja": "-", "Description": "Ascetic of divine focus, igniting spiritual fire", "Vahana_Symbolism": "Represents strength, fertility, and dharma"},
-    {"Deva": "🌟 Raivata", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "✨ Radiance", "Vāhana": "🦌 Deer", "Bīja": "-", "Description": "Bearer of radiant insight, illuminating wisdom", "Vahana_Symbolism": "Represents gentleness and swiftness"},
-    {"Deva": "🐍 Sarpī", "Type": "🌪️ Rudra", "Chakra": "🔴 Mūlādhāra", "Element": "🐉 Kundalinī", "Vāhana": "🐍 Serpent", "Bīja": "🕉️ Saṃ", "Description": "Awakener of kundalini, rooted in primal energy", "Vahana_Symbolism": "Symbolizes transformation and healing"},
-    {"Deva": "⚡ Vijra", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "🎯 Focus", "Vāhana": "🦅 Lightning Bird", "Bīja": "-", "Description": "Sharpened focus, striking with divine precision", "Vahana_Symbolism": "Symbolizes speed and power"},
-    {"Deva": "🌩️ Āśani", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "⚡ Thunderbolt", "Vāhana": "☁️ Thundercloud", "Bīja": "-", "Description": "Wielder of thunder, sparking transformative insight", "Vahana_Symbolism": "Symbolizes storm energy and transformation"},
-    {"Deva": "🌌 Mahān", "Type": "🌪️ Rudra", "Chakra": "⚪ Sahasrāra", "Element": "🌠 Greatness", "Vāhana": "🌠 Cosmic Mount", "Bīja": "-", "Description": "Embodiment of cosmic greatness, transcending limits", "Vahana_Symbolism": "Symbolizes transcendence and universality"},
-    {"Deva": "🌿 Ṛtudhvaja", "Type": "🌪️ Rudra", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "🌸 Cycle/Season", "Vāhana": "🛞 Chariot of Seasons", "Bīja": "-", "Description": "Ruler of seasonal cycles, flowing with nature’s rhythm", "Vahana_Symbolism": "Symbolizes cyclical time and harmony"},
-    {"Deva": "🌊 Āpaḥ", "Type": "🪨 Vasu", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "💧 Water", "Vāhana": "🐢 Turtle", "Bīja": "🕉️ Om Āpaḥ Svaḥ", "Description": "Essence of life-giving water, nurturing fluidity", "Vahana_Symbolism": "Represents longevity and stability"},
-    {"Deva": "🧭 Dhruva", "Type": "🪨 Vasu", "Chakra": "⚪ Sahasrāra", "Element": "🧘 Stillness", "Vāhana": "🌌 Pole Star", "Bīja": "🪷 Dhruva Stuti", "Description": "Symbol of unwavering stillness, guiding eternal focus", "Vahana_Symbolism": "Represents steadfastness and guidance"},
-    {"Deva": "🌙 Soma", "Type": "🪨 Vasu", "Chakra": "🟣 Ājñā", "Element": "🥛 Moon Nectar", "Vāhana": "🦌 Deer", "Bīja": "🕉️ Om Somāya Namaḥ", "Description": "Bearer of divine nectar, soothing with lunar calm", "Vahana_Symbolism": "Represents gentleness and swiftness"},
-    {"Deva": "🌍 Dhara", "Type": "🪨 Vasu", "Chakra": "🔴 Mūlādhāra", "Element": "🌎 Earth", "Vāhana": "🐘 Elephant", "Bīja": "🕉️ Om Dhārayantyai Namaḥ", "Description": "Sustainer of earth, grounding with steadfast support", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
-    {"Deva": "💨 Anila", "Type": "🪨 Vasu", "Chakra": "💚 Anāhata", "Element": "🌬️ Air", "Vāhana": "🦌 Deer", "Bīja": "🕉️ Om Anilāya Namaḥ", "Description": "Breath of life, moving with airy grace", "Vahana_Symbolism": "Represents gentleness and swiftness"},
-    {"Deva": "🔥 Anala", "Type": "🪨 Vasu", "Chakra": "🟡 Maṇipūra", "Element": "🔥 Fire", "Vāhana": "🐏 Ram", "Bīja": "🕉️ Om Agnaye Namaḥ", "Description": "Flame of transformation, burning with inner power", "Vahana_Symbolism": "Represents leadership and sacrifice"},
-    {"Deva": "🌅 Pratyūṣa", "Type": "🪨 Vasu", "Chakra": "🟦 Viśuddha", "Element": "🌄 Dawn", "Vāhana": "🐎 Golden Horse", "Bīja": "-", "Description": "Herald of dawn, awakening vibrant expression", "Vahana_Symbolism": "Represents new beginnings and vitality"},
-    {"Deva": "💡 Prabhāsa", "Type": "🪨 Vasu", "Chakra": "⚪ Sahasrāra", "Element": "💫 Radiance", "Vāhana": "🦚 Peacock", "Bīja": "-", "Description": "Source of radiant brilliance, illuminating divinity", "Vahana_Symbolism": "Symbolizes beauty and immortality"},
-    {"Deva": "🌬️ Nāṣatya", "Type": "👬 Aśvin", "Chakra": "🌀 Iḍā", "Element": "🌬️ Breath (Left)", "Vāhana": "🐎 Horse", "Bīja": "🕉️ Om Nāsatye Namaḥ", "Description": "Healer of lunar breath, restoring balance", "Vahana_Symbolism": "Represents speed, freedom, and nobility"},
-    {"Deva": "💪 Dasra", "Type": "👬 Aśvin", "Chakra": "🔥 Piṅgalā", "Element": "🔋 Vitality (Right)", "Vāhana": "🐎 Horse", "Bīja": "🕉️ Om Dasrāya Namaḥ", "Description": "Energizer of solar vitality, igniting strength", "Vahana_Symbolism": "Represents speed, freedom, and nobility"}
-]
-# Standardize chakra names
-chakra_name_map = {
-    'Mūlādhāra': 'Muladhara',
-    'Svādhiṣṭhāna': 'Svadhisthana',
-    'Maṇipūra': 'Manipura',
-    'Anāhata': 'Anahata',
-    'Viśuddha': 'Vishuddha',
-    'Ājñā': 'Ajna',
-    'Sahasrāra': 'Sahasrara',
-    'Iḍā': 'Ida',
-    'Piṅgalā': 'Pingala',
-    'All': 'All'
-}
-devas_df = pd.DataFrame(deva_data)
-devas_df['Chakra_Name'] = devas_df['Chakra'].apply(lambda x: chakra_name_map.get(x.split()[-1], x.split()[-1]))
-# Page configuration
-st.set_page_config(page_title="Name-Chakra-Deva Explorer", layout="wide")
-st.title("🧘 Name-Chakra-Deva Explorer")
-st.markdown("Discover how your name or phrase resonates with chakras, emotions (bhavas), aesthetic feelings (rasas), and Vedic Devas. Enter in English Latin script or Devanagari, or try an example like 'Om' or 'Gayatri Mantra'.")
-# Tabs for navigation
-tabs = st.tabs(["Name Analysis", "Deva Explorer", "Chakras", "Bhavas and Rasas", "Vedic Devas", "How It Works"])
 # Name Analysis Tab
-with tabs[0]:
+def render_name_analysis():
     st.header("Name Analysis")
     examples = ["", "Rama", "Krishna", "Om", "Gayatri Mantra"]
     selected_example = st.selectbox("Try an Example", examples, help="Select an example to see its analysis.")
     input_method = st.radio("Input Method", ["Transliteration", "Devanagari"])
    
     if input_method == "Transliteration":
-        transliteration_scheme = st.selectbox("Select Transliteration Scheme", list(scheme_map.keys()), help="Choose how your name is converted to Sanskrit. For example, in ITRANS, use 'rAma' or 'raama' for राम. See [Transliteration Guide](https://en.wikipedia.org/wiki/ITRANS).")
-        english_mode = st.checkbox("Treat as English Name (use standard spelling, approximates to Sanskrit sounds)", value=False, help="Check this if your input is an English name not following the transliteration scheme. It will lowercase the input and convert capital vowels to long sounds (e.g., 'A' to 'aa').")
+        auto_detect = st.checkbox("Auto-detect scheme and English mode", value=False, help="Try every scheme, with and without English mode, and use the reading that fits your input best.")
+        transliteration_scheme = st.selectbox("Select Transliteration Scheme", list(scheme_map.keys()), disabled=auto_detect, help="Choose how your name is converted to Sanskrit. For example, in ITRANS, use 'rAma' or 'raama' for राम. See [Transliteration Guide](https://en.wikipedia.org/wiki/ITRANS).")
+        english_mode = st.checkbox("Treat as English Name (use standard spelling, approximates to Sanskrit sounds)", value=False, disabled=auto_detect, help="Check this if your input is an English name not following the transliteration scheme. It will lowercase the input and convert capital vowels to long sounds (e.g., 'A' to 'aa').")
         name_input = st.text_input("Enter Name or Phrase in English Latin Script", value=selected_example if selected_example else "", placeholder="e.g., 'rAma' or 'Om Namah Shivaya'")
        
         if name_input:
             try:
-                if english_mode:
-                    name_input = preprocess_input(name_input)
-                devanagari_name = transliterate(name_input, scheme_map[transliteration_scheme], sanscript.DEVANAGARI)
-                # Transliterate to ITRANS for phoneme matching
-                itrans_name = transliterate(name_input, scheme_map[transliteration_scheme], sanscript.ITRANS)
-                st.write(f"Name/Phrase in Devanagari: {devanagari_name}")
-               
-                # Extract consonants and vowels in ITRANS using parser
-                cons, vows = extract_phonemes(itrans_name)
-                consonants_with_chakras = []
-                for con in cons:
-                    key = con + 'a'
-                    if key in chakra_mappings:
-                        consonants_with_chakras.append((key, chakra_mappings[key]))
-                    else:
-                        # Try lowercase/uppercase adjustment if not found (rare)
-                        key_lower = con.lower() + 'a'
-                        if key_lower in chakra_mappings:
-                            consonants_with_chakras.append((key_lower, chakra_mappings[key_lower]))
-                vowel_count = sum(1 for char in vows if char in vowels)
-               
-                if not consonants_with_chakras and not vowel_count:
-                    st.error("No valid Sanskrit phonemes found. Try a different spelling or scheme.")
-                else:
-                    # Count chakra frequencies
-                    chakra_counts = {'Muladhara': 0, 'Svadhisthana': 0, 'Manipura': 0, 'Anahata': 0, 'Vishuddha': 0, 'Ajna': 0}
-                    for _, chakra in consonants_with_chakras:
-                        chakra_counts[chakra] += 1
-                   
-                    # Find dominant chakra(s)
-                    max_count = max(chakra_counts.values())
-                    if max_count == 0 and vowel_count == 0:
-                        st.error("No valid consonants or vowels to determine chakra.")
+                with trace() as stages:
+                    devanagari_input = False
+                    if auto_detect:
+                        with timed('detect'):
+                            detected = lazy_import('chakra_detect').detect_scheme(name_input)
+                        transliteration_scheme, english_mode, devanagari_input = detected['scheme'], detected['english_mode'], detected['devanagari']
+                        st.caption("Detected: Devanagari" if devanagari_input else f"Detected: {transliteration_scheme}{', English spelling' if english_mode else ''}")
+                    with timed('analysis'):
+                        result = cached_analysis(name_input, transliteration_scheme, english_mode, devanagari_input)
+                    st.write(f"Name/Phrase in Devanagari: {result['devanagari']}")
+                    if result['status'] == 'no_phonemes':
+                        st.error("No valid Sanskrit phonemes found. Try a different spelling or scheme.")
+                        if not auto_detect:
+                            suggest_options(name_input, transliteration_scheme, english_mode)
                     else:
-                        dominant_chakras = [chakra for chakra, count in chakra_counts.items() if count == max_count and count > 0]
-                        dominant_chakra = dominant_chakras[0] if dominant_chakras else 'Vishuddha' if vowel_count > 0 else None
-                       
-                        # Generate dynamic prose
-                        prose = []
-                        if max_count > 0:
-                            dominant_letters = [char for char, chakra in consonants_with_chakras if chakra == dominant_chakra]
-                            prose.append(f"For the name or phrase **{devanagari_name}**, the dominant chakra is **{dominant_chakra}** {bhava_rasa_mappings[dominant_chakra]['emoji']}, activated by the letters {', '.join(dominant_letters)}, which {bhava_rasa_mappings[dominant_chakra]['description']}.")
-                            if len(dominant_chakras) > 1:
-                                other_chakras = dominant_chakras[1:]
-                                other_texts = [f"{chakra} {bhava_rasa_mappings[chakra]['emoji']} (letters {', '.join([char for char, chakra_ in consonants_with_chakras if chakra_ == chakra])})" for chakra in other_chakras]
-                                prose.append(f"Additionally, the chakras {', '.join(other_texts)} are equally prominent, bringing their unique energies.")
-                            prose.append(f"The dominant emotion is **{bhava_rasa_mappings[dominant_chakra]['bhava']}** {bhava_rasa_mappings[dominant_chakra]['bhava_emoji']}, evoking the **{bhava_rasa_mappings[dominant_chakra]['rasa']}** feeling {bhava_rasa_mappings[dominant_chakra]['rasa_emoji']}, embodying its essence.")
-                            prose.append(f"This vibrant energy aligns with the element **{bhava_rasa_mappings[dominant_chakra]['element']}**, symbolizing its core qualities.")
-                           
-                            # Add Deva descriptions
-                            associated_devas = devas_df[(devas_df['Chakra_Name'] == dominant_chakra) | (devas_df['Chakra_Name'] == 'All')].head(2)
-                            if not associated_devas.empty:
-                                deva_texts = [f"{row['Deva']}, {row['Description'].lower()}, whose {row['Vāhana'].lower()} vahana {row['Vahana_Symbolism'].lower()}" for _, row in associated_devas.iterrows()]
-                                prose.append(f"It resonates with Devas like {', and '.join(deva_texts)}.")
-                        if vowel_count > 0:
-                            prose.append(f"Moreover, the {vowel_count} vowel{'s' if vowel_count > 1 else ''} activate the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, enhancing communication and self-expression.")
-                        if max_count == 0 and vowel_count > 0:
-                            prose = [f"The name or phrase **{devanagari_name}** consists only of vowels, primarily activating the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, which {bhava_rasa_mappings['Vishuddha']['description']}. The dominant emotion is **{bhava_rasa_mappings['Vishuddha']['bhava']}** {bhava_rasa_mappings['Vishuddha']['bhava_emoji']}, evoking the **{bhava_rasa_mappings['Vishuddha']['rasa']}** feeling {bhava_rasa_mappings['Vishuddha']['rasa_emoji']}, embodying its essence."]
-                       
-                        st.markdown(" ".join(prose))
-                       
-                        # Display associated Devas
-                        if dominant_chakra:
-                            st.subheader("Associated Vedic Devas")
-                            associated_devas = devas_df[(devas_df['Chakra_Name'] == dominant_chakra) | (devas_df['Chakra_Name'] == 'All')]
-                            if not associated_devas.empty:
-                                for _, row in associated_devas.iterrows():
-                                    with st.expander(f"{row['Deva']} ({row['Type']})"):
-                                        st.markdown(f"""
-                                        - **Chakra**: {row['Chakra']}
-                                        - **Element**: {row['Element']}
-                                        - **Vāhana**: {row['Vāhana']}
-                                        - **Bīja Mantra**: {row['Bīja']}
-                                        - **Description**: {row['Description']}
-                                        - **Vahana Symbolism**: {row['Vahana_Symbolism']}
-                                        """)
-                            else:
-                                st.write("No specific Devas are directly associated with this chakra.")
-                       
-                        # Bar chart for chakra distribution
-                        st.subheader("Chakra Distribution")
-                        chakra_df = pd.DataFrame(list(chakra_counts.items()), columns=['Chakra', 'Frequency'])
-                        if vowel_count > 0:
-                            chakra_df.loc[len(chakra_df)] = ['Vishuddha (Vowels)', vowel_count]
-                        fig = px.bar(chakra_df, x='Chakra', y='Frequency', title='Chakra Distribution in Name', color='Chakra', color_discrete_map=chakra_colors)
-                        st.plotly_chart(fig, use_container_width=True)
+                        render_analysis(result)
+                st.session_state['last_stages'] = stages
             except Exception as e:
                 st.error(f"Error processing name: {str(e)}. Ensure correct format for the selected scheme, e.g., 'rAma' for ITRANS. See [Transliteration Guide](https://en.wikipedia.org/wiki/ITRANS).")
+        render_long_text(transliteration_scheme, english_mode)
     else:
         devanagari_name = st.text_input("Enter Name or Phrase in Devanagari", value=selected_example if selected_example and selected_example not in ["Rama", "Krishna", "Om", "Gayatri Mantra"] else "", placeholder="e.g., राम")
        
         if devanagari_name:
             try:
-                # Validate Devanagari input
-                if not any('\u0900' <= char <= '\u097F' for char in devanagari_name):
-                    st.error("Please enter a valid Devanagari name or phrase.")
-                else:
-                    st.write(f"Name/Phrase in Devanagari: {devanagari_name}")
-                    # Transliterate Devanagari to ITRANS for phoneme matching
-                    itrans_name = transliterate(devanagari_name, sanscript.DEVANAGARI, sanscript.ITRANS)
-                   
-                    # Extract consonants and vowels in ITRANS using parser
-                    cons, vows = extract_phonemes(itrans_name)
-                    consonants_with_chakras = []
-                    for con in cons:
-                        key = con + 'a'
-                        if key in chakra_mappings:
-                            consonants_with_chakras.append((key, chakra_mappings[key]))
-                        else:
-                            key_lower = con.lower() + 'a'
-                            if key_lower in chakra_mappings:
-                                consonants_with_chakras.append((key_lower, chakra_mappings[key_lower]))
-                    vowel_count = sum(1 for char in vows if char in vowels)
-                   
-                    if not consonants_with_chakras and not vowel_count:
-                        st.error("No valid Sanskrit phonemes found in the name.")
+                with trace() as stages:
+                    with timed('analysis'):
+                        result = cached_analysis(devanagari_name, devanagari=True)
+                    # Validate Devanagari input
+                    if result['status'] == 'invalid_devanagari':
+                        st.error("Please enter a valid Devanagari name or phrase.")
                     else:
-                        # Count chakra frequencies
-                        chakra_counts = {'Muladhara': 0, 'Svadhisthana': 0, 'Manipura': 0, 'Anahata': 0, 'Vishuddha': 0, 'Ajna': 0}
-                        for _, chakra in consonants_with_chakras:
-                            chakra_counts[chakra] += 1
-                       
-                        # Find dominant chakra(s)
-                        max_count = max(chakra_counts.values())
-                        if max_count == 0 and vowel_count == 0:
-                            st.error("No valid consonants or vowels to determine chakra.")
+                        st.write(f"Name/Phrase in Devanagari: {devanagari_name}")
+                        if result['status'] == 'no_phonemes':
+                            st.error("No valid Sanskrit phonemes found in the name.")
                         else:
-                            dominant_chakras = [chakra for chakra, count in chakra_counts.items() if count == max_count and count > 0]
-                            dominant_chakra = dominant_chakras[0] if dominant_chakras else 'Vishuddha' if vowel_count > 0 else None
-                           
-                            # Generate dynamic prose
-                            prose = []
-                            if max_count > 0:
-                                dominant_letters = [char for char, chakra in consonants_with_chakras if chakra == dominant_chakra]
-                                prose.append(f"For the name or phrase **{devanagari_name}**, the dominant chakra is **{dominant_chakra}** {bhava_rasa_mappings[dominant_chakra]['emoji']}, activated by the letters {', '.join(dominant_letters)}, which {bhava_rasa_mappings[dominant_chakra]['description']}.")
-                                if len(dominant_chakras) > 1:
-                                    other_chakras = dominant_chakras[1:]
-                                    other_texts = [f"{chakra} {bhava_rasa_mappings[chakra]['emoji']} (letters {', '.join([char for char, chakra_ in consonants_with_chakras if chakra_ == chakra])})" for chakra in other_chakras]
-                                    prose.append(f"Additionally, the chakras {', '.join(other_texts)} are equally prominent, bringing their unique energies.")
-                                prose.append(f"The dominant emotion is **{bhava_rasa_mappings[dominant_chakra]['bhava']}** {bhava_rasa_mappings[dominant_chakra]['bhava_emoji']}, evoking the **{bhava_rasa_mappings[dominant_chakra]['rasa']}** feeling {bhava_rasa_mappings[dominant_chakra]['rasa_emoji']}, embodying its essence.")
-                                prose.append(f"This vibrant energy aligns with the element **{bhava_rasa_mappings[dominant_chakra]['element']}**, symbolizing its core qualities.")
-                               
-                                # Add Deva descriptions
-                                associated_devas = devas_df[(devas_df['Chakra_Name'] == dominant_chakra) | (devas_df['Chakra_Name'] == 'All')].head(2)
-                                if not associated_devas.empty:
-                                    deva_texts = [f"{row['Deva']}, {row['Description'].lower()}, whose {row['Vāhana'].lower()} vahana {row['Vahana_Symbolism'].lower()}" for _, row in associated_devas.iterrows()]
-                                    prose.append(f"It resonates with Devas like {', and '.join(deva_texts)}.")
-                            if vowel_count > 0:
-                                prose.append(f"Moreover, the {vowel_count} vowel{'s' if vowel_count > 1 else ''} activate the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, enhancing communication and self-expression.")
-                            if max_count == 0 and vowel_count > 0:
-                                prose = [f"The name or phrase **{devanagari_name}** consists only of vowels, primarily activating the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, which {bhava_rasa_mappings['Vishuddha']['description']}. The dominant emotion is **{bhava_rasa_mappings['Vishuddha']['bhava']}** {bhava_rasa_mappings['Vishuddha']['bhava_emoji']}, evoking the **{bhava_rasa_mappings['Vishuddha']['rasa']}** feeling {bhava_rasa_mappings['Vishuddha']['rasa_emoji']}, embodying its essence."]
-                           
-                            st.markdown(" ".join(prose))
-                           
-                            # Display associated Devas
-                            if dominant_chakra:
-                                st.subheader("Associated Vedic Devas")
-                                associated_devas = devas_df[(devas_df['Chakra_Name'] == dominant_chakra) | (devas_df['Chakra_Name'] == 'All')]
-                                if not associated_devas.empty:
-                                    for _, row in associated_devas.iterrows():
-                                        with st.expander(f"{row['Deva']} ({row['Type']})"):
-                                            st.markdown(f"""
-                                            - **Chakra**: {row['Chakra']}
-                                            - **Element**: {row['Element']}
-                                            - **Vāhana**: {row['Vāhana']}
-                                            - **Bīja Mantra**: {row['Bīja']}
-                                            - **Description**: {row['Description']}
-                                            - **Vahana Symbolism**: {row['Vahana_Symbolism']}
-                                            """)
-                                else:
-                                    st.write("No specific Devas are directly associated with this chakra.")
-                           
-                            # Bar chart for chakra distribution
-                            st.subheader("Chakra Distribution")
-                            chakra_df = pd.DataFrame(list(chakra_counts.items()), columns=['Chakra', 'Frequency'])
-                            if vowel_count > 0:
-                                chakra_df.loc[len(chakra_df)] = ['Vishuddha (Vowels)', vowel_count]
-                            fig = px.bar(chakra_df, x='Chakra', y='Frequency', title='Chakra Distribution in Name', color='Chakra', color_discrete_map=chakra_colors)
-                            st.plotly_chart(fig, use_container_width=True)
+                            render_analysis(result)
+                st.session_state['last_stages'] = stages
             except Exception as e:
                 st.error(f"Error processing name: {str(e)}. Ensure the name contains valid Devanagari characters.")
+        render_long_text(devanagari=True)
+
+# Most line/verse profiles kept and shown for an uploaded text
+max_profile_rows = 5000
+
+# Uploaded long texts are analysed chunk by chunk, keeping only the running totals and a
+# capped number of line/verse profiles in memory
+def render_long_text(scheme="ITRANS", english_mode=False, devanagari=False):
+    with st.expander("Analyze a long text (upload a file)"):
+        uploaded = st.file_uploader("Text file (UTF-8), e.g. a scripture or book", type=['txt'], help="Analysed in chunks, so very long texts are fine. Uses the input options above.")
+        per = st.radio("Profile per", ["verse", "line"], horizontal=True, help="Verses end at a blank line or a double danda (॥ or ||).")
+        if uploaded is None:
+            return
+        np = lazy_import('numpy')
+        chakra_stream = lazy_import('chakra_stream')
+        totals = np.zeros(len(chakras) + 1, dtype=np.int64)
+        profiles = []
+        with timed('stream'):
+            for profile in chakra_stream.stream_profiles(chakra_stream.read_text_chunks(uploaded), scheme, english_mode, devanagari, per, totals):
+                if len(profiles) < max_profile_rows:
+                    profiles.append(profile)
+        summary = chakra_stream.summarize(totals)
+        if not summary['dominant_chakra']:
+            st.error("No valid Sanskrit phonemes found in the text.")
+            return
+        st.write(f"Dominant chakra of the whole text: **{summary['dominant_chakra']}**")
+        st.plotly_chart(chakra_figure(tuple(summary['chakra_counts'].items()), summary['vowel_count']), use_container_width=True)
+        pd = lazy_import('pandas')
+        table = pd.DataFrame([{'Segment': profile['segment'], 'Lines': f"{profile['start_line']}-{profile['end_line']}", 'Text': profile['text'], **profile['chakra_counts'], 'Vowels': profile['vowel_count'], 'Dominant': profile['dominant_chakra']} for profile in profiles])
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        if len(profiles) == max_profile_rows:
+            st.caption(f"Showing the first {max_profile_rows} {per}s; use `python -m chakra_cli stream` for full profiles.")
+# Reverse-lookup indexes, opened once per process and shared by all sessions
+@st.cache_resource(max_entries=8)
+def load_index(path):
+    return lazy_import('chakra_index').ChakraIndex(path)
+
+# Index over an uploaded name list (one name per line), built once per distinct upload.
+# Returns (index, directory): the temporary directory is removed once the cache entry is
+# evicted and the pair garbage-collected.
+@st.cache_resource(max_entries=4)
+def uploaded_index(data, scheme, english_mode, devanagari):
+    tempfile = lazy_import('tempfile')
+    chakra_results = lazy_import('chakra_results')
+    chakra_index = lazy_import('chakra_index')
+    names = data.decode('utf-8', errors='replace').splitlines()
+    directory = tempfile.TemporaryDirectory(prefix='chakra_index_', ignore_cleanup_errors=True)
+    blocks = (chakra_results.analyze_block(names[i:i + 10000], scheme, english_mode, devanagari) for i in range(0, len(names), 10000))
+    try:
+        chakra_index.build_index(directory.name, blocks, {'scheme': scheme, 'english_mode': english_mode, 'devanagari': devanagari})
+        return chakra_index.ChakraIndex(directory.name), directory
+    except BaseException:
+        directory.cleanup()
+        raise
+
+# Name Search Tab
+def render_name_search():
+    st.header("Name Search")
+    st.markdown("Find names in a corpus by their chakra profile. Build an index once with `python -m chakra_cli index names.csv names.idx` and open it here, or upload a name list.")
+    path = st.text_input("Index directory", value=os.environ.get('CHAKRA_INDEX', ''), placeholder="e.g. names.idx")
+    uploaded = st.file_uploader("Or upload a name list (one name per line, ITRANS)", type=['txt'])
+    index = None
+    try:
+        if uploaded is not None:
+            with st.spinner("Indexing names..."):
+                index, _ = uploaded_index(uploaded.getvalue(), "ITRANS", False, False)
+        elif path:
+            index = load_index(path)
+    except (OSError, ValueError) as e:
+        st.error(f"Could not open the index: {e}")
+    if index is None:
+        return
+    st.caption(f"{len(index)} names indexed")
+    chakra_names = [chakra['Name'] for chakra in chakras]
+    dominant = st.selectbox("Dominant chakra", ["Any"] + chakra_names)
+    containing = st.multiselect("Containing phonemes of", chakra_names + ['Vowels'])
+    filters = {'dominant': None if dominant == "Any" else dominant, 'containing': containing}
+    rank = st.radio("Rank by", ["None", "Similarity to a name", "Similarity to a profile"], horizontal=True)
+    limit = st.number_input("Results", min_value=1, max_value=1000, value=50)
+    try:
+        with timed('index_search'):
+            if rank == "Similarity to a name":
+                like = st.text_input("Name to compare with", placeholder="e.g. kRRiShNa")
+                if not like:
+                    return
+                results = index.similar_to(like, limit, **filters)
+            elif rank == "Similarity to a profile":
+                columns = st.columns(len(chakra_names))
+                profile = {chakra: column.slider(chakra, 0, 5, 0) for chakra, column in zip(chakra_names, columns)}
+                if not any(profile.values()):
+                    st.info("Set at least one chakra weight.")
+                    return
+                results = index.nearest(profile, limit, **filters)
+            else:
+                st.write(f"{index.count_matching(**filters)} matching names")
+                results = index.filter(limit=limit, **filters)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    pd = lazy_import('pandas')
+    st.dataframe(pd.DataFrame([{'Name': result['name'], **result['chakra_counts'], 'Vowels': result['vowel_count'], 'Dominant': result['dominant_chakra'], **({'Similarity': round(result['similarity'], 3)} if 'similarity' in result else {})} for result in results]), hide_index=True, use_container_width=True)
+# Most names compared at once
+max_compare_names = 2000
+# Categories of the comparison charts, in chakra order with the vowel count last
+compare_categories = [chakra['Name'] for chakra in chakras] + ['Vishuddha (Vowels)']
+
+# Comparison chart template for this session: the traces, colours and layout are built once
+# and every rerun only replaces their data arrays, so rendering cost does not grow with the
+# number of traces or reruns. Kept per session because figures are mutated in place.
+def comparison_figure(kind):
+    figures = st.session_state.setdefault('comparison_figures', {})
+    if kind not in figures:
+        go = lazy_import('plotly.graph_objects')
+        if kind == "Grouped bars":
+            fig = go.Figure([go.Bar(name=category, marker_color=chakra_colors[category]) for category in compare_categories])
+            fig.update_layout(barmode='group', title='Chakra Distribution by Name', xaxis_title='Name', yaxis_title='Frequency', legend_title='Chakra')
+        else:
+            fig = go.Figure(go.Heatmap(x=compare_categories, colorscale='Viridis', colorbar_title='Frequency'))
+            fig.update_layout(title='Chakra Distribution by Name', yaxis_autorange='reversed')
+        figures[kind] = fig
+    return figures[kind]
+
+# Compare Names Tab
+def render_compare_names():
+    st.header("Compare Names")
+    st.markdown("Compare the chakra profiles of a family's or team's names side by side. All names are analysed together in one pass.")
+    input_method = st.radio("Input Method", ["Transliteration", "Devanagari"], key='compare_input_method', horizontal=True)
+    scheme, english_mode = "ITRANS", False
+    if input_method == "Transliteration":
+        scheme = st.selectbox("Transliteration Scheme", list(scheme_map.keys()), key='compare_scheme')
+        english_mode = st.checkbox("Treat as English Names", value=False, key='compare_english')
+    pasted = st.text_area("Names, one per line", placeholder="rAma\nsItA\nlakShmaNa")
+    uploaded = st.file_uploader("Or upload a name list (one name per line)", type=['txt'], key='compare_upload')
+    text = uploaded.getvalue().decode('utf-8', errors='replace') if uploaded is not None else pasted
+    names = list(dict.fromkeys(name.strip() for name in text.splitlines() if name.strip()))
+    if not names:
+        return
+    if len(names) > max_compare_names:
+        st.caption(f"Comparing the first {max_compare_names} of {len(names)} names.")
+        names = names[:max_compare_names]
+    with timed('compare'):
+        results = lazy_import('chakra_scoring').analyze_batch(names, scheme, english_mode, input_method == "Devanagari")
+    scored = [(name, result) for name, result in zip(names, results) if result['status'] == 'ok']
+    skipped = [name for name, result in zip(names, results) if result['status'] != 'ok']
+    if skipped:
+        st.warning(f"No Sanskrit phonemes found in: {', '.join(skipped[:20])}{' ...' if len(skipped) > 20 else ''}")
+    if not scored:
+        return
+    labels = [name for name, _ in scored]
+    counts = [[*result['chakra_counts'].values(), result['vowel_count']] for _, result in scored]
+    kind = st.radio("Chart", ["Grouped bars", "Heatmap"], index=0 if len(scored) <= 20 else 1, horizontal=True)
+    with timed('chart_build'):
+        fig = comparison_figure(kind)
+        with fig.batch_update():
+            if kind == "Grouped bars":
+                for i, trace in enumerate(fig.data):
+                    trace.x = labels
+                    trace.y = [row[i] for row in counts]
+            else:
+                fig.data[0].y = labels
+                fig.data[0].z = counts
+                fig.layout.height = max(400, 24 * len(labels) + 160)
+    with timed('chart_render'):
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe({
+        'Name': labels,
+        'Devanagari': [result['devanagari'] for _, result in scored],
+        'Dominant': [result['dominant_chakra'] for _, result in scored],
+        'Ties': [', '.join(result['dominant_chakras']) for _, result in scored],
+    }, hide_index=True, use_container_width=True)
 # Deva Explorer Tab
-with tabs[1]:
+def render_deva_explorer():
     st.header("Deva Explorer")
     st.markdown("Explore the 33 Vedic Devas, their associated chakras, elements, vāhanas, and mantras.")
    
-    for _, row in devas_df.iterrows():
-        with st.expander(f"{row['Deva']} ({row['Type']})"):
-            st.markdown(f"""
-            - **Chakra**: {row['Chakra']}
-            - **Element**: {row['Element']}
-            - **Vāhana**: {row['Vāhana']}
-            - **Bīja Mantra**: {row['Bīja']}
-            - **Description**: {row['Description']}
-            - **Vahana Symbolism**: {row['Vahana_Symbolism']}
-            """)
+    for label, card in reference_bundle()['deva_cards']:
+        with st.expander(label):
+            st.markdown(card)
 # Chakras Tab
-with tabs[2]:
+def render_chakras():
     st.header("Chakras")
     st.markdown("Chakras are energy centers in the body, each linked to specific Sanskrit phonemes and qualities. Learn more at [Sanskrit and Chakras](https://www.ruhgu.com/sanskrit-and-chakras/).")
-   
-    chakras = [
-        {"Name": "Muladhara", "Emoji": "🔴", "Description": "Resonates with grounding and survival, evoking caution and alertness", "Letters": "va, sha, Sha, sa", "Element": "Earth"},
-        {"Name": "Svadhisthana", "Emoji": "🧡", "Description": "Flows with creativity and passion, igniting love and beauty", "Letters": "ba, bha, ma, ya, ra, la", "Element": "Water"},
-        {"Name": "Manipura", "Emoji": "🟡", "Description": "Radiates confidence and power, inspiring courage and heroism", "Letters": "Da, Dha, Na, ta, tha, da, dha, na, pa, pha", "Element": "Fire"},
-        {"Name": "Anahata", "Emoji": "💚", "Description": "Pulses with love and empathy, fostering deep connections", "Letters": "ka, kha, ga, gha, Nga, cha, Cha, ja, jha, Nja, Ta, Tha", "Element": "Air"},
-        {"Name": "Vishuddha", "Emoji": "🟦", "Description": "Vibrates with expression and joy, sparking laughter and communication", "Letters": "a, aa, i, ii, u, uu, RRi, RRI, LLi, LLI, e, ai, o, au, aM, aH", "Element": "Ether"},
-        {"Name": "Ajna", "Emoji": "🟣", "Description": "Illuminates intuition and insight, evoking wonder and awe", "Letters": "ha, kSha", "Element": "Light"}
-    ]
-   
-    for chakra in chakras:
-        st.subheader(f"{chakra['Emoji']} {chakra['Name']}")
-        st.markdown(f"""
-        - **Description**: {chakra['Description']}.
-        - **Element**: {chakra['Element']}
-        - **Associated Phonemes**: {chakra['Letters']}
-        """)
+    st.markdown(reference_bundle()['chakra_markdown'])
 # Bhavas and Rasas Tab
-with tabs[3]:
+def render_bhavas():
     st.header("Bhavas and Rasas")
     st.markdown("Bhavas are emotive states, and rasas are aesthetic emotions from Indian classical arts, as described in the Natyashastra. The connections to chakras are modern interpretations, not traditional facts. Learn more at [Rasa Aesthetics](https://en.wikipedia.org/wiki/Rasa_(aesthetics)).")
-   
-    for chakra, info in bhava_rasa_mappings.items():
-        st.subheader(f"{info['emoji']} {chakra}")
-        st.markdown(f"""
-        - **Bhava (Emotion)**: {info['bhava']} {info['bhava_emoji']}
-        - **Rasa (Aesthetic Feeling)**: {info['rasa']} {info['rasa_emoji']}
-        - **Description**: {info['description'].capitalize()}.
-        - **Element**: {info['element']}
-        """)
+    st.markdown(reference_bundle()['bhava_markdown'])
 # Vedic Devas Tab
-with tabs[4]:
+def render_vedic_devas():
     st.header("Vedic Devas")
     st.markdown("The 33 Vedic Devas are divine forces in Hinduism, including 12 Ādityas, 11 Rudras, 8 Vasus, and 2 Aśvins. Each is associated with specific energies and qualities. Learn more at [Hindu Deities](https://en.wikipedia.org/wiki/Hindu_deities).")
     st.write("Explore the Devas in the 'Deva Explorer' tab to learn about their chakras, elements, vāhanas, and mantras.")
 # How It Works Tab
-with tabs[5]:
+def render_how_it_works():
     st.header("How It Works")
     st.markdown("""
     This app analyzes your name or phrase by converting it to Sanskrit (Devanagari) script. Each consonant is mapped to a chakra based on traditional Sanskrit petal associations, using English transliterations (ITRANS scheme), and vowels activate the Vishuddha chakra. The chakra with the most phonemes is considered dominant, with ties noted as significant influences. Emotions (bhavas) and aesthetic feelings (rasas) are assigned based on the dominant chakra, creating a personalized story. The narrative includes connections to Vedic Devas, describing their roles and vahana symbolisms. The mappings are interpretive, blending traditional phonetics with modern creativity. For more on Sanskrit and chakras, visit [Sanskrit and Chakras](https://www.ruhgu.com/sanskrit-and-chakras/).
@@ -419,3 +330,61 @@ with tabs[5]:
     - **Transliteration**: Enter in English Latin script using a scheme like ITRANS ('rAma' or 'raama' for राम). Choose a scheme from the dropdown. See [Transliteration Schemes](https://en.wikipedia.org/wiki/ITRANS). For standard English names, check the 'Treat as English Name' box for better approximation.
     - **Devanagari**: Type directly in Sanskrit script (e.g., राम) if you have a Devanagari keyboard.
     """)
+# Cache counters exported with the stage metrics
+def cache_counters():
+    stats = cache_stats()
+    counters = {'analysis_cache_hit': stats['hits'], 'analysis_cache_miss': stats['misses']}
+    if 'disk' in stats:
+        counters.update({f"disk_cache_{key}": stats['disk'][key] for key in ('hits', 'misses', 'writes', 'evictions', 'errors')})
+    return counters
+
+# Sidebar debug panel with the last analysis' stage timings and process-wide aggregates
+def render_debug_panel():
+    with st.sidebar.expander("Debug: performance", expanded=False):
+        stages = st.session_state.get('last_stages')
+        if stages:
+            st.markdown("**Last analysis**\n" + "\n".join(f"- {stage}: {seconds * 1000:.2f} ms" for stage, seconds in stages.items()))
+        histograms = chakra_metrics.snapshot()['histograms']
+        if histograms:
+            st.markdown("**All sessions**\n" + "\n".join(f"- {stage}: {h['count']} runs, mean {h['sum'] / h['count'] * 1000:.2f} ms" for stage, h in sorted(histograms.items())))
+        stats = cache_stats()
+        st.markdown(f"**Analysis cache**: {stats['hits']} hits, {stats['misses']} misses, {stats['size']}/{stats['max_size']} entries")
+        if 'disk' in stats:
+            disk = stats['disk']
+            st.markdown(f"**Disk cache**: {disk['hits']} hits, {disk['misses']} misses, {disk['writes']} writes, {disk['evictions']} evictions, {disk['errors']} errors")
+        timings = startup_metrics()
+        if timings:
+            st.markdown("**Startup**\n" + "\n".join(f"- {key}: {seconds * 1000:.1f} ms" for key, seconds in timings.items()))
+        st.download_button("Download Prometheus metrics", chakra_metrics.prometheus_text(cache_counters()), file_name="chakra_metrics.prom", mime="text/plain")
+
+sections = {
+    "Name Analysis": render_name_analysis,
+    "Compare Names": render_compare_names,
+    "Name Search": render_name_search,
+    "Deva Explorer": render_deva_explorer,
+    "Chakras": render_chakras,
+    "Bhavas and Rasas": render_bhavas,
+    "Vedic Devas": render_vedic_devas,
+    "How It Works": render_how_it_works,
+}
+# Page configuration
+st.set_page_config(page_title="Name-Chakra-Deva Explorer", layout="wide")
+st.title("🧘 Name-Chakra-Deva Explorer")
+st.markdown("Discover how your name or phrase resonates with chakras, emotions (bhavas), aesthetic feelings (rasas), and Vedic Devas. Enter in English Latin script or Devanagari, or try an example like 'Om' or 'Gayatri Mantra'.")
+if fast_start:
+    # Navigation that only runs the selected section
+    section = st.radio("Section", list(sections.keys()), horizontal=True, label_visibility="collapsed")
+    sections[section]()
+else:
+    # Tabs for navigation
+    for tab, render_section in zip(st.tabs(list(sections.keys())), sections.values()):
+        with tab:
+            render_section()
+# Report import and first render times once per process
+if 'first render' not in startup_metrics():
+    record_startup_timing('import app modules', _imports_done - _script_start)
+    record_startup_timing('first render', time.perf_counter() - _script_start)
+# Opt-in instrumentation (CHAKRA_METRICS=1): debug panel and Prometheus file export
+if chakra_metrics.enabled:
+    render_debug_panel()
+    chakra_metrics.maybe_export(cache_counters())
@@ -0,0 +1,127 @@
+import json
+import random
+import sys
+import time
+import tracemalloc
+from chakra_engine import preprocess_input, extract_phonemes, score_itrans, build_prose, analyze_name, prepare_name, devanagari_to_itrans, scheme_map
+from chakra_scoring import score_batch
+
+# ITRANS syllables used to generate realistic names and phrases
+onsets = ['k', 'kh', 'g', 'gh', 'ch', 'j', 'T', 'D', 'N', 't', 'th', 'd', 'dh', 'n', 'p', 'ph', 'b', 'bh', 'm', 'y', 'r', 'l', 'v', 'sh', 'Sh', 's', 'h', 'kSh', 'kr', 'pr', 'shr', 'tr', 'dhy', 'sv']
+nuclei = ['a', 'a', 'a', 'A', 'i', 'I', 'u', 'U', 'RRi', 'e', 'ai', 'o', 'au']
+codas = ['', '', '', 'M', 'H', 'n', 'm', 'r']
+
+# Deterministic corpus: short names and long mantra-like phrases in ITRANS
+def generate_corpus(seed=108, names=2000, mantras=50, mantra_words=40):
+    rng = random.Random(seed)
+
+    def word(syllables):
+        return ''.join(rng.choice(onsets) + rng.choice(nuclei) for _ in range(syllables)) + rng.choice(codas)
+
+    return {
+        'names': [word(rng.randint(2, 4)) for _ in range(names)],
+        'mantras': [' '.join(word(rng.randint(1, 4)) for _ in range(mantra_words)) for _ in range(mantras)],
+    }
+
+# The corpus in every transliteration scheme, plus Devanagari
+def corpus_by_scheme(corpus):
+    from indic_transliteration.sanscript import transliterate
+    by_scheme = {}
+    for kind, texts in corpus.items():
+        for scheme, code in scheme_map.items():
+            by_scheme[(kind, scheme)] = [transliterate(text, 'itrans', code) for text in texts]
+        by_scheme[(kind, 'Devanagari')] = [transliterate(text, 'itrans', 'devanagari') for text in texts]
+    return by_scheme
+
+# Time fn over every input; returns throughput, p50/p99 latency and peak traced memory
+def measure(fn, inputs, repeat=3):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            t0 = time.perf_counter_ns()
+            fn(item)
+            latencies.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    # Peak memory is measured in a separate pass so tracing does not skew the timings
+    tracemalloc.start()
+    for item in inputs:
+        fn(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'ops_per_s': len(latencies) / elapsed,
+        'p50_us': latencies[len(latencies) // 2] / 1000,
+        'p99_us': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1000,
+        'peak_kb': peak / 1024,
+    }
+
+# Benchmark cases as (name, function, inputs)
+def benchmark_cases(by_scheme):
+    cases = []
+    for kind in ('names', 'mantras'):
+        itrans = by_scheme[(kind, 'ITRANS')]
+        devanagari = by_scheme[(kind, 'Devanagari')]
+        analyzed = [analyze_name(text, with_prose=False) for text in itrans]
+        cases.append((f"preprocess_input/{kind}", preprocess_input, itrans))
+        for scheme in scheme_map:
+            cases.append((f"prepare_name/{scheme}/{kind}", lambda text, scheme=scheme: prepare_name(text, scheme), by_scheme[(kind, scheme)]))
+        cases.append((f"prepare_name/Devanagari/{kind}", lambda text: prepare_name(text, devanagari=True), devanagari))
+        cases.append((f"devanagari_to_itrans/{kind}", devanagari_to_itrans, devanagari))
+        cases.append((f"extract_phonemes/{kind}", extract_phonemes, itrans))
+        cases.append((f"score_itrans/{kind}", score_itrans, itrans))
+        cases.append((f"build_prose/{kind}", build_prose, [result for result in analyzed if result['status'] == 'ok']))
+        cases.append((f"analyze_name/{kind}", analyze_name, itrans))
+        # Whole-batch scoring, timed per batch of up to 100 texts
+        itrans_batches = [prepare_name(text)[1] for text in itrans]
+        batches = [itrans_batches[i:i + 100] for i in range(0, len(itrans_batches), 100)]
+        cases.append((f"score_batch[100]/{kind}", score_batch, batches))
+    return cases
+
+def run_benchmarks(seed=108, repeat=3, only=None):
+    by_scheme = corpus_by_scheme(generate_corpus(seed))
+    results = {}
+    for name, fn, inputs in benchmark_cases(by_scheme):
+        if only and only not in name:
+            continue
+        results[name] = measure(fn, inputs, repeat)
+    return results
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':40} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KB':>10}" + ("  vs baseline" if baseline else ""))
+    for name, stats in results.items():
+        line = f"{name:40} {stats['ops_per_s']:12.0f} {stats['p50_us']:10.1f} {stats['p99_us']:10.1f} {stats['peak_kb']:10.1f}"
+        if baseline and name in baseline:
+            line += f"  {stats['ops_per_s'] / baseline[name]['ops_per_s']:6.2f}x"
+        print(line)
+
+# Benchmarks whose throughput dropped by more than tolerance relative to the baseline
+def regressions(results, baseline, tolerance=0.2):
+    return [name for name, stats in results.items()
+            if name in baseline and stats['ops_per_s'] < baseline[name]['ops_per_s'] * (1 - tolerance)]
+
+def run_bench(args):
+    results = run_benchmarks(args.seed, args.repeat, args.only)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Saved baseline to {args.save}", file=sys.stderr)
+    if baseline:
+        slower = regressions(results, baseline, args.tolerance)
+        if slower:
+            print(f"Regressions (more than {args.tolerance:.0%} slower): {', '.join(slower)}", file=sys.stderr)
+            sys.exit(1)
+
+def add_bench_arguments(parser):
+    parser.add_argument('--seed', type=int, default=108, help="Seed for the synthetic corpus.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes over each input set.")
+    parser.add_argument('--only', help="Run only benchmarks whose name contains this text.")
+    parser.add_argument('--save', help="Write results as a JSON baseline to this path.")
+    parser.add_argument('--compare', help="Compare against a saved JSON baseline; exits 1 on regressions.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed throughput drop before a benchmark counts as a regression.")
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from chakra_engine import chakra_order, chakra_mappings, bhava_rasa_mappings, deva_data, chakra_name_map, chakra_colors, chakras, deva_chakra_name
+
+# Reference data compiled once per process into a read-only bundle: the Deva records,
+# chakra -> Deva row indexes, and every piece of markdown the app renders from the data.
+# Set CHAKRA_BUNDLE_PATH to keep the compiled bundle in a pickle file shared by all
+# processes; it is rebuilt when missing or when the data or bundle_format changes. Only
+# point it at a file you trust: loading a pickle can run code.
+bundle_path = os.environ.get('CHAKRA_BUNDLE_PATH')
+# Bump when the bundle layout or the rendered markdown changes
+bundle_format = 1
+
+deva_fields = ['Deva', 'Type', 'Chakra', 'Element', 'Vāhana', 'Bīja', 'Description', 'Vahana_Symbolism']
+bhava_fields = ['bhava', 'rasa', 'bhava_emoji', 'rasa_emoji', 'description', 'emoji', 'element']
+chakra_fields = ['Name', 'Emoji', 'Description', 'Letters', 'Element']
+
+# Problems in the reference data, as messages; an empty list means it is consistent
+def reference_problems():
+    problems = []
+    for key, chakra in chakra_mappings.items():
+        if chakra not in chakra_order:
+            problems.append(f"chakra_mappings['{key}']: unknown chakra '{chakra}'")
+    for chakra in chakra_order:
+        info = bhava_rasa_mappings.get(chakra)
+        if info is None:
+            problems.append(f"bhava_rasa_mappings: missing '{chakra}'")
+            continue
+        problems.extend(f"bhava_rasa_mappings['{chakra}']: missing '{field}'" for field in bhava_fields if not info.get(field))
+    problems.extend(f"chakra_colors: missing '{chakra}'" for chakra in chakra_order + ['Vishuddha (Vowels)'] if chakra not in chakra_colors)
+    if [chakra.get('Name') for chakra in chakras] != chakra_order:
+        problems.append("chakras: names must follow chakra_order")
+    for chakra in chakras:
+        problems.extend(f"chakras['{chakra.get('Name')}']: missing '{field}'" for field in chakra_fields if not chakra.get(field))
+    seen = set()
+    for i, deva in enumerate(deva_data):
+        label = deva.get('Deva', f"row {i}")
+        problems.extend(f"deva_data '{label}': missing '{field}'" for field in deva_fields if not deva.get(field))
+        if label in seen:
+            problems.append(f"deva_data '{label}': duplicate Deva")
+        seen.add(label)
+        if deva.get('Chakra') and deva_chakra_name(deva) not in chakra_name_map.values():
+            problems.append(f"deva_data '{label}': unknown chakra '{deva['Chakra']}'")
+    return problems
+
+# Raise ValueError listing every problem in the reference data
+def validate_reference():
+    problems = reference_problems()
+    if problems:
+        raise ValueError("Invalid reference data:\n" + "\n".join(problems))
+
+# Hash of the reference data and bundle format; a bundle of another version is rebuilt
+def reference_version():
+    data = [bundle_format, chakra_order, chakra_mappings, bhava_rasa_mappings, deva_data, chakra_name_map, chakra_colors, chakras]
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+# Markdown for one Deva card
+def deva_card_markdown(deva):
+    return f"""
+    - **Chakra**: {deva['Chakra']}
+    - **Element**: {deva['Element']}
+    - **Vāhana**: {deva['Vāhana']}
+    - **Bīja Mantra**: {deva['Bīja']}
+    - **Description**: {deva['Description']}
+    - **Vahana Symbolism**: {deva['Vahana_Symbolism']}
+    """
+
+# The prose sentence naming a chakra's first two Devas, as chakra_engine.build_prose writes it
+def deva_sentence(devas):
+    deva_texts = [f"{deva['Deva']}, {deva['Description'].lower()}, whose {deva['Vāhana'].lower()} vahana {deva['Vahana_Symbolism'].lower()}" for deva in devas[:2]]
+    return f"It resonates with Devas like {', and '.join(deva_texts)}." if deva_texts else ''
+
+# Validate the reference data and compile it into a bundle dict:
+#  devas - Deva records, in deva_data order
+#  deva_cards - (expander label, card markdown) per Deva
+#  chakra_devas - chakra -> tuple of Deva rows linked to it or to all chakras
+#  deva_prose - chakra -> the Deva sentence of the analysis prose
+#  chakra_markdown, bhava_markdown - the Chakras and Bhavas and Rasas tabs
+def build_bundle():
+    validate_reference()
+    devas = tuple(dict(deva) for deva in deva_data)
+    rows_by_chakra = {}
+    for i, deva in enumerate(devas):
+        rows_by_chakra.setdefault(deva_chakra_name(deva), []).append(i)
+    all_rows = rows_by_chakra.get('All', [])
+    chakra_devas = {chakra: tuple(sorted(set(rows_by_chakra.get(chakra, [])) | set(all_rows))) for chakra in set(chakra_order) | set(rows_by_chakra)}
+    chakra_sections = [f"""### {chakra['Emoji']} {chakra['Name']}
+- **Description**: {chakra['Description']}.
+- **Element**: {chakra['Element']}
+- **Associated Phonemes**: {chakra['Letters']}""" for chakra in chakras]
+    bhava_sections = [f"""### {info['emoji']} {chakra}
+- **Bhava (Emotion)**: {info['bhava']} {info['bhava_emoji']}
+- **Rasa (Aesthetic Feeling)**: {info['rasa']} {info['rasa_emoji']}
+- **Description**: {info['description'].capitalize()}.
+- **Element**: {info['element']}""" for chakra, info in bhava_rasa_mappings.items()]
+    return {
+        'format': bundle_format,
+        'version': reference_version(),
+        'devas': devas,
+        'deva_cards': tuple((f"{deva['Deva']} ({deva['Type']})", deva_card_markdown(deva)) for deva in devas),
+        'chakra_devas': chakra_devas,
+        'deva_prose': {chakra: deva_sentence([devas[i] for i in rows]) for chakra, rows in chakra_devas.items()},
+        'chakra_markdown': "\n\n".join(chakra_sections),
+        'bhava_markdown': "\n\n".join(bhava_sections),
+    }
+
+# Build the bundle and write it to path as a pickle (atomically, so readers never see a partial file)
+def compile_bundle(path):
+    bundle = build_bundle()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    return bundle
+
+# A compiled bundle from path, or None if it is missing, unreadable or of another version
+def load_bundle(path):
+    try:
+        with open(path, 'rb') as f:
+            bundle = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        return None
+    if not isinstance(bundle, dict) or bundle.get('format') != bundle_format or bundle.get('version') != reference_version():
+        return None
+    return bundle
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+# The process-wide bundle: loaded from CHAKRA_BUNDLE_PATH when it holds the current
+# version, otherwise built (and written there, if set) on first use
+def reference_bundle():
+    global _bundle
+    if _bundle is not None:
+        return _bundle
+    with _bundle_lock:
+        if _bundle is None:
+            bundle = load_bundle(bundle_path) if bundle_path else None
+            if bundle is None and bundle_path:
+                try:
+                    bundle = compile_bundle(bundle_path)
+                except OSError:
+                    pass
+            _bundle = bundle or build_bundle()
+        return _bundle
+
+# Deva rows linked to a chakra (or to all chakras), falling back to the all-chakra Devas
+def chakra_deva_rows(chakra):
+    chakra_devas = reference_bundle()['chakra_devas']
+    return chakra_devas[chakra] if chakra in chakra_devas else chakra_devas.get('All', ())
+
+# (label, markdown) cards of a chakra's Devas, straight from the bundle
+def chakra_deva_cards(chakra):
+    bundle = reference_bundle()
+    return [bundle['deva_cards'][i] for i in chakra_deva_rows(chakra)]
+
+# The Deva sentence of the analysis prose for a chakra
+def chakra_deva_prose(chakra):
+    deva_prose = reference_bundle()['deva_prose']
+    return deva_prose[chakra] if chakra in deva_prose else deva_prose.get('All', '')
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from chakra_engine import vowels, base_consonants, vowels_list, preprocess_input
+from chakra_bundle import reference_version
+
+# Opt-in persistent result cache: set CHAKRA_CACHE_PATH to an SQLite file shared by every
+# app replica, service worker and CLI run on the machine
+cache_path = os.environ.get('CHAKRA_CACHE_PATH')
+cache_max_entries = int(os.environ.get('CHAKRA_CACHE_MAX_ENTRIES', 100000))
+# Bump when the stored result layout or the prose templates change
+cache_format = 1
+# A hit refreshes the entry's last-used time at most this often, to keep reads read-only
+touch_interval = 3600
+# Check the entry count after this many writes by one process (or a tenth of max_entries,
+# if smaller), and whenever a process opens the cache
+evict_every = 256
+
+# Hash of everything results depend on: the reference data (chakra_bundle hashes every
+# table) and the vowel and phoneme lists; entries of other versions are ignored
+def data_version():
+    data = [cache_format, reference_version(), vowels, base_consonants, vowels_list]
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+# Cache key of an analysis: only what the result depends on, so e.g. English-mode inputs
+# differing in case share an entry and Devanagari inputs ignore the scheme
+def cache_key(name_input, scheme="ITRANS", english_mode=False, devanagari=False):
+    if devanagari:
+        return f"deva\x1f{name_input}"
+    if english_mode:
+        return f"{scheme}\x1fenglish\x1f{preprocess_input(name_input)}"
+    return f"{scheme}\x1f\x1f{name_input}"
+
+# Analysis results stored as JSON in SQLite (WAL mode, so readers never block each other),
+# evicting the least recently used entries beyond max_entries. Entries are keyed by name
+# and data version, so versions running side by side (e.g. during a rolling deploy) keep
+# their own entries; other versions' entries are the first to be evicted. Database errors
+# are counted and otherwise ignored: the cache must never break an analysis.
+class ResultCache:
+    def __init__(self, path, max_entries=cache_max_entries, version=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = version or data_version()
+        self.lock = threading.Lock()
+        self.connection = None
+        self.pid = None
+        self.writes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+
+    # One connection per process (connections must not cross a fork)
+    def _connect(self):
+        if self.connection is not None and self.pid == os.getpid():
+            return self.connection
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # A table keyed by name alone (so versions overwrote each other's entries) is dropped
+            key_columns = {row[1] for row in connection.execute("PRAGMA table_info(results)") if row[5]}
+            if key_columns and 'version' not in key_columns:
+                connection.execute("DROP TABLE results")
+            connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT NOT NULL, version TEXT NOT NULL, value TEXT NOT NULL, used REAL NOT NULL, PRIMARY KEY (key, version))")
+            connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        self.connection, self.pid = connection, os.getpid()
+        self.writes = 0
+        self._evict(connection)
+        return connection
+
+    def get(self, name_input, scheme="ITRANS", english_mode=False, devanagari=False):
+        key = cache_key(name_input, scheme, english_mode, devanagari)
+        with self.lock:
+            try:
+                connection = self._connect()
+                row = connection.execute("SELECT value, used FROM results WHERE key = ? AND version = ?", (key, self.version)).fetchone()
+                if row is None:
+                    self.stats['misses'] += 1
+                    return None
+                now = time.time()
+                if now - row[1] > touch_interval:
+                    connection.execute("UPDATE results SET used = ? WHERE key = ? AND version = ?", (now, key, self.version))
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+                return None
+            self.stats['hits'] += 1
+        result = json.loads(row[0])
+        if 'consonants' in result:
+            result['consonants'] = [tuple(pair) for pair in result['consonants']]
+        result['input'] = name_input
+        return result
+
+    def put(self, name_input, result, scheme="ITRANS", english_mode=False, devanagari=False):
+        self.put_many([(name_input, result)], scheme, english_mode, devanagari)
+
+    # Store (name, result) pairs analysed with the same options in one transaction
+    def put_many(self, items, scheme="ITRANS", english_mode=False, devanagari=False):
+        now = time.time()
+        rows = []
+        for name_input, result in items:
+            value = {key: value for key, value in result.items() if key != 'input'}
+            rows.append((cache_key(name_input, scheme, english_mode, devanagari), self.version, json.dumps(value, ensure_ascii=False), now))
+        with self.lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    connection.executemany("INSERT OR REPLACE INTO results (key, version, value, used) VALUES (?, ?, ?, ?)", rows)
+                self.stats['writes'] += len(rows)
+                self.writes += len(rows)
+                if self.writes >= min(evict_every, max(1, self.max_entries // 10)):
+                    self.writes = 0
+                    self._evict(connection)
+            except sqlite3.Error:
+                self.stats['errors'] += 1
+
+    # Delete entries down to 90% of max_entries: those of other versions (e.g. written by
+    # an older app during a rolling deploy) first, then the least recently used
+    def _evict(self, connection):
+        count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - self.max_entries * 9 // 10
+        connection.execute("DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY version = ?, used LIMIT ?)", (self.version, excess))
+        self.stats['evictions'] += excess
+
+    # Names (from `names`) that have no entry yet, without duplicates
+    def missing(self, names, scheme="ITRANS", english_mode=False, devanagari=False):
+        keys = {}
+        for name in names:
+            keys.setdefault(cache_key(name, scheme, english_mode, devanagari), name)
+        found = set()
+        with self.lock:
+            connection = self._connect()
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                query = f"SELECT key FROM results WHERE version = ? AND key IN ({','.join('?' * len(chunk))})"
+                found.update(key for key, in connection.execute(query, [self.version, *chunk]))
+        return [name for key, name in keys.items() if key not in found]
+
+    def entries(self):
+        with self.lock:
+            try:
+                return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            except sqlite3.Error:
+                return 0
+
+_shared = None
+_shared_lock = threading.Lock()
+
+# The process-wide cache at CHAKRA_CACHE_PATH, or None when the cache is not configured
+def shared_cache():
+    global _shared
+    if not cache_path:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = ResultCache(cache_path)
+        return _shared
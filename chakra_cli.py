@@ -0,0 +1,297 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from chakra_engine import chakra_order, scheme_map, analyze_name
+from chakra_results import analyze_block
+from chakra_service import add_serve_arguments, serve as serve_service
+from chakra_bench import add_bench_arguments, run_bench
+from chakra_stream import read_text_chunks, stream_profiles, summarize
+from chakra_index import build_index, ChakraIndex, count_keys
+from chakra_cache import ResultCache, cache_path, cache_max_entries
+from chakra_bundle import compile_bundle, bundle_path
+
+# Columns written for every analysed name
+output_columns = ['name', 'devanagari', 'status'] + chakra_order + ['vowels', 'dominant_chakra', 'dominant_chakras']
+
+# Columns written for every line or verse profile of a streamed text
+profile_columns = ['segment', 'start_line', 'end_line', 'text'] + chakra_order + ['vowels', 'dominant_chakra', 'dominant_chakras']
+
+# Read names in chunks from a CSV file (with header) or a plain text file (one name per line)
+def read_chunks(path, column=None, chunk_size=10000):
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            reader = csv.reader(f)
+            header = next(reader, [])
+            index = header.index(column) if column else 0
+            names = (row[index] for row in reader if len(row) > index)
+        else:
+            names = (line.rstrip('\r\n') for line in f)
+        chunk = []
+        for name in names:
+            chunk.append(name)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+# Flatten a line or verse profile into an output row
+def profile_row(profile):
+    row = {key: profile[key] for key in ('segment', 'start_line', 'end_line', 'text')}
+    row.update(profile['chakra_counts'])
+    row['vowels'] = profile['vowel_count']
+    row['dominant_chakra'] = profile['dominant_chakra'] or ''
+    row['dominant_chakras'] = '|'.join(profile['dominant_chakras'])
+    return row
+
+# Analyse one chunk of names; runs inside worker processes and returns a compact
+# ResultBlock, which is also what travels back to the parent process
+def analyze_chunk(task):
+    names, scheme, english_mode, devanagari, with_prose = task
+    return analyze_block(names, scheme, english_mode, devanagari, with_prose)
+
+# Incremental CSV writer
+class CsvSink:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def write_block(self, block):
+        self.writer.writerows(block.rows())
+
+    def close(self):
+        self.file.close()
+
+# Incremental Parquet writer, one row group per chunk
+class ParquetSink:
+    def __init__(self, path, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow), or use a .csv output path.")
+        self.pa = pa
+        self.columns = columns
+        types = {col: pa.int32() for col in chakra_order + ['vowels', 'segment', 'start_line', 'end_line']}
+        types.update({col: pa.dictionary(pa.int8(), pa.string()) for col in ('status', 'dominant_chakra', 'dominant_chakras')})
+        self.schema = pa.schema([(col, types.get(col, pa.string())) for col in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        data = {col: [row.get(col) for row in rows] for col in self.columns}
+        self.writer.write_table(self.pa.Table.from_pydict(data, schema=self.schema))
+
+    # Strings and code columns go through as-is; counts are widened to the file's int32
+    # columns (Parquet stores small integers as INT32 either way)
+    def write_block(self, block):
+        self.writer.write_table(block.to_arrow().select(self.columns).cast(self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def open_sink(path, columns):
+    if path.endswith('.parquet'):
+        return ParquetSink(path, columns)
+    return CsvSink(path, columns)
+
+# Run fn over tasks in a process pool, yielding results in input order as they complete
+def run_pooled(fn, tasks, workers):
+    if workers <= 1:
+        for task in tasks:
+            yield fn(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of chunks in flight so memory stays flat on huge inputs
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# Stream input chunks through a process pool, writing results incrementally
+def run_batch(args):
+    columns = output_columns + (['prose'] if args.prose else [])
+    sink = open_sink(args.output, columns)
+    tasks = ((chunk, args.scheme, args.english, args.devanagari, args.prose)
+             for chunk in read_chunks(args.input, args.column, args.chunk_size))
+    total = 0
+    try:
+        for block in run_pooled(analyze_chunk, tasks, args.workers):
+            sink.write_block(block)
+            total += len(block)
+    finally:
+        sink.close()
+    print(f"Analysed {total} names -> {args.output}", file=sys.stderr)
+
+# Build a reverse-lookup index over a name corpus
+def run_index(args):
+    tasks = ((chunk, args.scheme, args.english, args.devanagari, False)
+             for chunk in read_chunks(args.input, args.column, args.chunk_size))
+    options = {'scheme': args.scheme, 'english_mode': args.english, 'devanagari': args.devanagari}
+    count = build_index(args.index, run_pooled(analyze_chunk, tasks, args.workers), options)
+    print(f"Indexed {count} names -> {args.index}", file=sys.stderr)
+
+# Query an index by dominant chakra, contained chakras and/or profile similarity
+def run_search(args):
+    index = ChakraIndex(args.index)
+    filters = {'dominant': args.dominant, 'containing': args.containing, 'min_count': args.min_count}
+    try:
+        if args.like:
+            results = index.similar_to(args.like, args.limit, **filters)
+        elif args.profile:
+            profile = {key: float(weight) for key, _, weight in (item.partition('=') for item in args.profile.split(','))}
+            results = index.nearest(profile, args.limit, **filters)
+        else:
+            results = index.filter(limit=args.limit, **filters)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    for result in results:
+        json.dump(result, sys.stdout, ensure_ascii=False)
+        print()
+    if not (args.like or args.profile):
+        print(f"{index.count_matching(**filters)} of {len(index)} names match", file=sys.stderr)
+
+# Full analyses (with prose, as the app caches them) of one chunk of names; runs inside worker processes
+def analyze_full(task):
+    names, scheme, english_mode, devanagari = task
+    return [(name, analyze_name(name, scheme, english_mode, devanagari)) for name in names]
+
+# Pre-populate the on-disk result cache from a name list, skipping names already cached
+def run_warm(args):
+    path = args.cache or cache_path
+    if not path:
+        raise SystemExit("Set CHAKRA_CACHE_PATH or pass --cache.")
+    cache = ResultCache(path, args.max_entries)
+    tasks = ((cache.missing([name for name in chunk if name.strip()], args.scheme, args.english, args.devanagari), args.scheme, args.english, args.devanagari)
+             for chunk in read_chunks(args.input, args.column, args.chunk_size))
+    for items in run_pooled(analyze_full, tasks, args.workers):
+        cache.put_many(items, args.scheme, args.english, args.devanagari)
+    print(f"Cached {cache.stats['writes']} new analyses in {path} ({cache.entries()} entries)", file=sys.stderr)
+
+# Validate the reference data and compile it into the bundle file the app and service load
+def run_bundle(args):
+    path = args.output or bundle_path
+    if not path:
+        raise SystemExit("Set CHAKRA_BUNDLE_PATH or pass an output path.")
+    try:
+        bundle = compile_bundle(path)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(f"Compiled reference bundle {bundle['version']} ({len(bundle['devas'])} Devas) to {path}", file=sys.stderr)
+
+# Analyse one long text in constant memory: profiles are written as they are produced and
+# the whole-text totals are printed as JSON at the end
+def run_stream(args):
+    per = args.per if args.output else None
+    sink = open_sink(args.output, profile_columns) if args.output else None
+    totals = np.zeros(len(chakra_order) + 1, dtype=np.int64)
+    segments = 0
+    try:
+        with open(args.input, 'rb') as f:
+            rows = []
+            for profile in stream_profiles(read_text_chunks(f, args.chunk_size), args.scheme, args.english, args.devanagari, per, totals):
+                rows.append(profile_row(profile))
+                if len(rows) == 1000:
+                    sink.write(rows)
+                    segments += len(rows)
+                    rows = []
+            if rows:
+                sink.write(rows)
+                segments += len(rows)
+    finally:
+        if sink:
+            sink.close()
+    json.dump(summarize(totals), sys.stdout, ensure_ascii=False, indent=1)
+    print()
+    if sink:
+        print(f"Wrote {segments} {per} profiles -> {args.output}", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m chakra_cli", description="Headless Name-Chakra-Deva analysis.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help="Analyse a file of names and write a CSV or Parquet result table.")
+    batch.add_argument('input', help="Input .csv (with header) or text file with one name per line.")
+    batch.add_argument('output', help="Output path; .parquet writes Parquet, anything else CSV.")
+    batch.add_argument('--scheme', default="ITRANS", choices=list(scheme_map.keys()), help="Transliteration scheme of the input names.")
+    batch.add_argument('--english', action='store_true', help="Treat inputs as English names (same as the UI checkbox).")
+    batch.add_argument('--devanagari', action='store_true', help="Inputs are in Devanagari script.")
+    batch.add_argument('--column', help="CSV column holding the names (default: first column).")
+    batch.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    batch.add_argument('--chunk-size', type=int, default=10000, help="Names per work unit.")
+    batch.add_argument('--prose', action='store_true', help="Also write the narrative prose for each name.")
+    batch.set_defaults(func=run_batch)
+
+    stream = commands.add_parser('stream', help="Analyse one long text (e.g. a scripture) chunk by chunk with per-line or per-verse profiles.")
+    stream.add_argument('input', help="UTF-8 text file.")
+    stream.add_argument('--output', help="Write line/verse profiles to this .csv or .parquet path.")
+    stream.add_argument('--per', default='verse', choices=['line', 'verse'], help="Profile granularity; verses end at a blank line or a double danda.")
+    stream.add_argument('--scheme', default="ITRANS", choices=list(scheme_map.keys()), help="Transliteration scheme of the text.")
+    stream.add_argument('--english', action='store_true', help="Treat the text as English (same as the UI checkbox).")
+    stream.add_argument('--devanagari', action='store_true', help="The text is in Devanagari script.")
+    stream.add_argument('--chunk-size', type=int, default=1 << 16, help="Bytes read per chunk.")
+    stream.set_defaults(func=run_stream)
+
+    index = commands.add_parser('index', help="Build a reverse-lookup index of chakra profiles over a name corpus.")
+    index.add_argument('input', help="Input .csv (with header) or text file with one name per line.")
+    index.add_argument('index', help="Index directory to create.")
+    index.add_argument('--scheme', default="ITRANS", choices=list(scheme_map.keys()), help="Transliteration scheme of the input names.")
+    index.add_argument('--english', action='store_true', help="Treat inputs as English names (same as the UI checkbox).")
+    index.add_argument('--devanagari', action='store_true', help="Inputs are in Devanagari script.")
+    index.add_argument('--column', help="CSV column holding the names (default: first column).")
+    index.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    index.add_argument('--chunk-size', type=int, default=10000, help="Names per work unit.")
+    index.set_defaults(func=run_index)
+
+    search = commands.add_parser('search', help="Find indexed names by dominant chakra or chakra profile.")
+    search.add_argument('index', help="Index directory built with the index command.")
+    search.add_argument('--dominant', choices=chakra_order, help="Only names with this dominant chakra.")
+    search.add_argument('--containing', nargs='+', default=[], choices=count_keys, metavar='CHAKRA', help="Only names with phonemes of each of these chakras (or Vowels).")
+    search.add_argument('--min-count', type=int, default=1, help="Phonemes required for each --containing chakra.")
+    search.add_argument('--like', help="Rank names by similarity to this name's chakra profile.")
+    search.add_argument('--profile', help="Rank names by similarity to a profile, e.g. Anahata=3,Ajna=1.")
+    search.add_argument('--limit', type=int, default=20, help="Most names to return.")
+    search.set_defaults(func=run_search)
+
+    warm = commands.add_parser('warm', help="Pre-populate the on-disk result cache (CHAKRA_CACHE_PATH) from a name list.")
+    warm.add_argument('input', help="Input .csv (with header) or text file with one name per line.")
+    warm.add_argument('--cache', help="Cache file (default: CHAKRA_CACHE_PATH).")
+    warm.add_argument('--max-entries', type=int, default=cache_max_entries, help="Most entries kept; least recently used ones are evicted.")
+    warm.add_argument('--scheme', default="ITRANS", choices=list(scheme_map.keys()), help="Transliteration scheme of the input names.")
+    warm.add_argument('--english', action='store_true', help="Treat inputs as English names (same as the UI checkbox).")
+    warm.add_argument('--devanagari', action='store_true', help="Inputs are in Devanagari script.")
+    warm.add_argument('--column', help="CSV column holding the names (default: first column).")
+    warm.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    warm.add_argument('--chunk-size', type=int, default=1000, help="Names per work unit.")
+    warm.set_defaults(func=run_warm)
+
+    bundle = commands.add_parser('bundle', help="Validate the reference data and compile it into a bundle file (CHAKRA_BUNDLE_PATH).")
+    bundle.add_argument('output', nargs='?', help="Bundle file to write (default: CHAKRA_BUNDLE_PATH).")
+    bundle.set_defaults(func=run_bundle)
+
+    serve = commands.add_parser('serve', help="Run the JSON/HTTP analysis service (/analyze, /analyze/batch).")
+    add_serve_arguments(serve)
+    serve.set_defaults(func=serve_service)
+
+    bench = commands.add_parser('bench', help="Benchmark each analysis stage on a synthetic corpus in every scheme.")
+    add_bench_arguments(bench)
+    bench.set_defaults(func=run_bench)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
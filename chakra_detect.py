@@ -0,0 +1,151 @@
+import os
+import re
+import time
+from concurrent.futures import wait
+from functools import lru_cache
+from chakra_engine import scheme_map, preprocess_input, cached_analysis
+from chakra_metrics import timed
+
+# Time allowed for trying interpretations of one input; the candidates evaluated by then
+# are ranked (at least one always is). Set CHAKRA_DETECT_BUDGET_MS to change it.
+detect_budget = float(os.environ.get('CHAKRA_DETECT_BUDGET_MS', 50)) / 1000
+# Only the start of a long input is used to detect its scheme
+detect_sample = 200
+
+# Characters a scheme should transliterate: Latin letters and the marks some schemes put
+# before or between letters (Velthuis '.r' and '"s', ITRANS '~n' and 'R^i'); a mark at the
+# end of a word is ordinary punctuation
+_source_re = re.compile(r'[A-Za-z]|[.~"^_](?=\S)')
+# Any ASCII character left in the Devanagari, other than spaces and digits
+_passthrough_re = re.compile(r'[!-/:-~]')
+_letter_re = re.compile('[\u0904-\u0939\u0958-\u0961]')
+# Devanagari a wrong scheme tends to produce:
+#  - nukta letters (ज़, ख़, ऱ...), which have no Sanskrit phoneme
+#  - a vowel letter inside a word (रअम) instead of a vowel sign
+#  - anusvara or visarga without a vowel before it, a vowel sign without a consonant
+#  - a consonant cluster ending in ह (स्ह for 'sh'), or of four or more consonants
+#  - a virama followed by a danda or ASCII punctuation (क्।र् or क्.र् for Velthuis 'k.r'),
+#    or a danda directly before a letter (।र् for Velthuis '.r')
+_anomaly_re = re.compile(
+    '[\u093C\u0958-\u095F\u0929\u0931\u0934]'
+    '|(?<=[\u0904-\u0939\u093E-\u094D])[\u0904-\u0914]'
+    '|(?:^|(?<=[\\s\u094D]))[\u0900-\u0903]'
+    '|(?:^|(?<=[\\s\u0904-\u0914\u093E-\u094D]))[\u093E-\u094D]'
+    '|\u094D\u0939'
+    '|(?:[\u0915-\u0939]\u094D){3}[\u0915-\u0939]'
+    '|\u094D[\u0964\u0965!-/:-@\\[-`{-~]'
+    '|[\u0964\u0965](?=[\u0900-\u0963])'
+)
+# Title-case words ('Priya', 'Om Namah Shivaya') are usually plain English spellings
+_title_re = re.compile(r'[A-Z][a-z]+(?:[\s-]+[A-Z][a-z]+)*')
+
+# Scheme maps to and from Devanagari for every scheme, built once per process (before
+# any time budget starts) and reused by every detection
+@lru_cache(maxsize=1)
+def _transliterators():
+    from indic_transliteration import sanscript
+    maps = {}
+    for code in scheme_map.values():
+        maps[code, 'devanagari'] = sanscript.SchemeMap(sanscript.SCHEMES[code], sanscript.SCHEMES[sanscript.DEVANAGARI])
+        maps['devanagari', code] = sanscript.SchemeMap(sanscript.SCHEMES[sanscript.DEVANAGARI], sanscript.SCHEMES[code])
+    return maps
+
+def _transliterate(text, source, target):
+    from indic_transliteration.sanscript import transliterate
+    return transliterate(text, scheme_map=_transliterators()[source, target])
+
+# Every (scheme, english_mode) pair, most likely first: scheme_map order, with English
+# mode first for title-case input and last otherwise
+def candidate_options(name_input):
+    english_first = bool(_title_re.fullmatch(name_input.strip()))
+    modes = (True, False) if english_first else (False, True)
+    return [(scheme, english_mode) for english_mode in modes for scheme in scheme_map]
+
+# Score one interpretation of an input:
+#  coverage - share of the input's Latin letters and scheme marks the scheme transliterated
+#  round_trip - 1.0 if Devanagari -> scheme -> Devanagari gives the same text, else 0.5
+#  plausibility - share of Devanagari letters not in a pattern a wrong scheme produces
+# score is their product, and 0 when the Devanagari has no letters at all.
+def evaluate_candidate(name_input, scheme="ITRANS", english_mode=False):
+    code = scheme_map[scheme]
+    source = preprocess_input(name_input) if english_mode else name_input
+    devanagari_name = _transliterate(source, code, 'devanagari')
+    letters = len(_letter_re.findall(devanagari_name))
+    coverage = 1 - len(_source_re.findall(devanagari_name)) / max(1, len(_source_re.findall(source)))
+    round_trip = 1.0 if _transliterate(_transliterate(devanagari_name, 'devanagari', code), code, 'devanagari') == devanagari_name else 0.5
+    plausibility = max(0.0, 1 - len(_anomaly_re.findall(devanagari_name)) / max(1, letters))
+    return {
+        'scheme': scheme,
+        'english_mode': english_mode,
+        'devanagari': devanagari_name,
+        'coverage': round(coverage, 3),
+        'round_trip': round_trip,
+        'plausibility': round(plausibility, 3),
+        'score': round(coverage * round_trip * plausibility, 3) if letters else 0.0,
+        'passthrough': bool(_passthrough_re.search(devanagari_name)),
+    }
+
+# Work out how an input is meant to be read. Devanagari input is analysed as Devanagari;
+# otherwise every scheme is tried with and without English mode and the best-scoring
+# interpretation wins, ties going to the more likely option (see candidate_options).
+# Candidates run one after another until a perfect score that left no ASCII characters
+# untransliterated (which another scheme might read) or the time budget, or, given an
+# executor (e.g. a ProcessPoolExecutor), all at once, ranking those done within the budget.
+# Returns the chosen options, its score and the ranked candidates evaluated.
+def detect_scheme(name_input, budget=None, executor=None):
+    budget = detect_budget if budget is None else budget
+    if any('\u0900' <= char <= '\u097F' for char in name_input):
+        return {'scheme': "ITRANS", 'english_mode': False, 'devanagari': True, 'score': 1.0, 'candidates': []}
+    _transliterators()
+    sample = name_input[:detect_sample]
+    options, seen = [], set()
+    for scheme, english_mode in candidate_options(sample):
+        # Inputs that read the same in English mode (e.g. lowercase ITRANS) are tried once
+        key = (scheme_map[scheme], preprocess_input(sample) if english_mode else sample)
+        if key not in seen:
+            seen.add(key)
+            options.append((scheme, english_mode))
+
+    candidates = []
+    if executor is not None:
+        start = time.perf_counter()
+        futures = [executor.submit(evaluate_candidate, sample, scheme, english_mode) for scheme, english_mode in options]
+        wait(futures[:1])
+        done, pending = wait(futures, timeout=max(0.0, budget - (time.perf_counter() - start)))
+        for future in pending:
+            future.cancel()
+        candidates = [future.result() for future in futures if future in done and not future.exception()]
+    else:
+        deadline = time.perf_counter() + budget
+        for scheme, english_mode in options:
+            candidates.append(evaluate_candidate(sample, scheme, english_mode))
+            if (candidates[-1]['score'] == 1.0 and not candidates[-1]['passthrough']) or time.perf_counter() > deadline:
+                break
+    # Stable sort: equal scores keep their priority order
+    candidates.sort(key=lambda candidate: -candidate['score'])
+    best = candidates[0] if candidates else {'scheme': "ITRANS", 'english_mode': False, 'score': 0.0}
+    return {'scheme': best['scheme'], 'english_mode': best['english_mode'], 'devanagari': False, 'score': best['score'], 'candidates': candidates}
+
+# Analyse an input with detected options; the result (a copy of the cached analysis)
+# carries the detection under 'detected'
+def analyze_auto(name_input, budget=None, executor=None):
+    detected = detect_scheme(name_input, budget, executor)
+    result = cached_analysis(name_input, detected['scheme'], detected['english_mode'], detected['devanagari'])
+    return dict(result, detected={key: detected[key] for key in ('scheme', 'english_mode', 'devanagari', 'score')})
+
+# Batch form for the service: detect each name's options, then score the names in one
+# analyze_batch call per detected option set
+def analyze_auto_batch(names, with_prose=False, budget=None):
+    from chakra_scoring import analyze_batch
+    results = [None] * len(names)
+    groups = {}
+    for i, name in enumerate(names):
+        with timed('detect'):
+            detected = detect_scheme(name, budget) if name.strip() else {'scheme': "ITRANS", 'english_mode': False, 'devanagari': False, 'score': 0.0}
+        key = (detected['scheme'], detected['english_mode'], detected['devanagari'])
+        groups.setdefault(key, []).append((i, {field: detected[field] for field in ('scheme', 'english_mode', 'devanagari', 'score')}))
+    for (scheme, english_mode, devanagari), members in groups.items():
+        batch = analyze_batch([names[i] for i, _ in members], scheme, english_mode, devanagari, with_prose)
+        for (i, detected), result in zip(members, batch):
+            results[i] = dict(result, detected=detected)
+    return results
@@ -0,0 +1,326 @@
+import os
+import re
+from functools import lru_cache
+from chakra_metrics import timed, count
+
+# Preprocess function for English mode
+def preprocess_input(name_input):
+    vowel_map = {'A': 'aa', 'E': 'ee', 'I': 'ii', 'O': 'oo', 'U': 'uu'}
+    processed = ''
+    for char in name_input:
+        if char in vowel_map:
+            processed += vowel_map[char]
+        else:
+            processed += char.lower()
+    return processed
+
+# ITRANS phoneme inventories used by the parser
+base_consonants = ['kSh', 'Ng', 'Nj', 'Ch', 'Th', 'Dh', 'Sh', 'kh', 'gh', 'ch', 'jh', 'Th', 'Dh', 'ph', 'bh', 'sh', 'ph', 'bh', 'k', 'g', 'c', 'j', 'T', 'D', 't', 'd', 'p', 'b', 'm', 'y', 'r', 'l', 'v', 's', 'h', 'N']
+vowels_list = ['RRi', 'RRI', 'LLi', 'LLI', 'AI', 'AU', 'A', 'I', 'U', 'E', 'O', 'a', 'i', 'u', 'e', 'ai', 'au', 'o', 'M', 'H']
+
+# Longest-first alternation so the regex engine picks the longest phoneme at each position
+def _alternation(phonemes):
+    return '|'.join(re.escape(p) for p in sorted(set(phonemes), key=len, reverse=True))
+
+# A consonant with an optional following vowel (matra), a standalone vowel,
+# or any other single character, which is skipped
+phoneme_pattern = f"({_alternation(base_consonants)})({_alternation(vowels_list)})?|({_alternation(vowels_list)})|."
+_phoneme_re = re.compile(phoneme_pattern, re.DOTALL)
+
+# Parser function to extract base consonants and vowels from ITRANS string
+def extract_phonemes(itrans_name):
+    consonants_found = []
+    vowels_found = []
+    for consonant, matra, vowel in _phoneme_re.findall(itrans_name):
+        if consonant:
+            consonants_found.append(consonant)
+            # Implicit 'a' if no matra, but don't add to vowels (since not explicit)
+            if matra:
+                vowels_found.append(matra)
+        elif vowel:
+            vowels_found.append(vowel)
+    return consonants_found, vowels_found
+
+# Transliteration scheme mapping (indic_transliteration.sanscript scheme names, kept as
+# plain strings so the library is only imported when a name is transliterated)
+scheme_map = {
+    "ITRANS": 'itrans',
+    "Harvard-Kyoto": 'hk',
+    "SLP1": 'slp1',
+    "Velthuis": 'velthuis',
+    "WX": 'wx'
+}
+# Chakra mappings based on ITRANS transliterated consonants
+chakra_mappings = {
+    'ka': 'Anahata', 'kha': 'Anahata', 'ga': 'Anahata', 'gha': 'Anahata', 'Nga': 'Anahata',
+    'cha': 'Anahata', 'Cha': 'Anahata', 'ja': 'Anahata', 'jha': 'Anahata', 'Nja': 'Anahata',
+    'Ta': 'Anahata', 'Tha': 'Anahata',
+    'Da': 'Manipura', 'Dha': 'Manipura', 'Na': 'Manipura', 'ta': 'Manipura', 'tha': 'Manipura',
+    'da': 'Manipura', 'dha': 'Manipura', 'na': 'Manipura', 'pa': 'Manipura', 'pha': 'Manipura',
+    'ba': 'Svadhisthana', 'bha': 'Svadhisthana', 'ma': 'Svadhisthana', 'ya': 'Svadhisthana',
+    'ra': 'Svadhisthana', 'la': 'Svadhisthana',
+    'va': 'Muladhara', 'sha': 'Muladhara', 'Sha': 'Muladhara', 'sa': 'Muladhara',
+    'ha': 'Ajna', 'kSha': 'Ajna'
+}
+# Vowels for Vishuddha chakra in ITRANS
+vowels = ['a', 'aa', 'i', 'ii', 'u', 'uu', 'RRi', 'RRI', 'LLi', 'LLI', 'e', 'ai', 'o', 'au', 'aM', 'aH']
+# Bhava and Rasa mappings
+bhava_rasa_mappings = {
+    'Muladhara': {'bhava': 'Bhaya (Fear)', 'rasa': 'Bhayanaka (Fearful)', 'bhava_emoji': '😨', 'rasa_emoji': '😨', 'description': 'resonates with grounding and survival, evoking caution and alertness', 'emoji': '🔴', 'element': 'Earth'},
+    'Svadhisthana': {'bhava': 'Rati (Love)', 'rasa': 'Shringara (Romantic)', 'bhava_emoji': '❤️', 'rasa_emoji': '❤️', 'description': 'flows with creativity and passion, igniting love and beauty', 'emoji': '🧡', 'element': 'Water'},
+    'Manipura': {'bhava': 'Utsaha (Energy)', 'rasa': 'Veera (Heroic)', 'bhava_emoji': '💪', 'rasa_emoji': '💪', 'description': 'radiates confidence and power, inspiring courage and heroism', 'emoji': '🟡', 'element': 'Fire'},
+    'Anahata': {'bhava': 'Rati (Love)', 'rasa': 'Shringara (Compassionate)', 'bhava_emoji': '❤️', 'rasa_emoji': '❤️', 'description': 'pulses with love and empathy, fostering deep connections', 'emoji': '💚', 'element': 'Air'},
+    'Vishuddha': {'bhava': 'Hasya (Mirth)', 'rasa': 'Hasya (Comic)', 'bhava_emoji': '😂', 'rasa_emoji': '😂', 'description': 'vibrates with expression and joy, sparking laughter and communication', 'emoji': '🟦', 'element': 'Ether'},
+    'Ajna': {'bhava': 'Vismaya (Astonishment)', 'rasa': 'Adbhuta (Wonder)', 'bhava_emoji': '😲', 'rasa_emoji': '😲', 'description': 'illuminates intuition and insight, evoking wonder and awe', 'emoji': '🟣', 'element': 'Light'}
+}
+# Chakra colors used by the app's charts
+chakra_colors = {
+    'Muladhara': 'red',
+    'Svadhisthana': 'orange',
+    'Manipura': 'yellow',
+    'Anahata': 'green',
+    'Vishuddha': 'blue',
+    'Ajna': 'indigo',
+    'Vishuddha (Vowels)': 'blue'
+}
+# Chakra reference content for the Chakras tab
+chakras = [
+    {"Name": "Muladhara", "Emoji": "🔴", "Description": "Resonates with grounding and survival, evoking caution and alertness", "Letters": "va, sha, Sha, sa", "Element": "Earth"},
+    {"Name": "Svadhisthana", "Emoji": "🧡", "Description": "Flows with creativity and passion, igniting love and beauty", "Letters": "ba, bha, ma, ya, ra, la", "Element": "Water"},
+    {"Name": "Manipura", "Emoji": "🟡", "Description": "Radiates confidence and power, inspiring courage and heroism", "Letters": "Da, Dha, Na, ta, tha, da, dha, na, pa, pha", "Element": "Fire"},
+    {"Name": "Anahata", "Emoji": "💚", "Description": "Pulses with love and empathy, fostering deep connections", "Letters": "ka, kha, ga, gha, Nga, cha, Cha, ja, jha, Nja, Ta, Tha", "Element": "Air"},
+    {"Name": "Vishuddha", "Emoji": "🟦", "Description": "Vibrates with expression and joy, sparking laughter and communication", "Letters": "a, aa, i, ii, u, uu, RRi, RRI, LLi, LLI, e, ai, o, au, aM, aH", "Element": "Ether"},
+    {"Name": "Ajna", "Emoji": "🟣", "Description": "Illuminates intuition and insight, evoking wonder and awe", "Letters": "ha, kSha", "Element": "Light"}
+]
+# Deva dataset
+deva_data = [
+    {"Deva": "🌊 Varuṇa", "Type": "☀️ Āditya", "Chakra": "🟦 Viśuddha", "Element": "💧 Water", "Vāhana": "🐊 Makara", "Bīja": "🕉️ Om Vam Varuṇāya Namaḥ", "Description": "Guardian of cosmic order, ruling the vast oceans with truth", "Vahana_Symbolism": "Symbolizes mastery over water and emotions"},
+    {"Deva": "🌞 Mitra", "Type": "☀️ Āditya", "Chakra": "💚 Anāhata", "Element": "🔆 Solar", "Vāhana": "🐎 Horse", "Bīja": "-", "Description": "Embodiment of friendship and harmony, shining with solar warmth", "Vahana_Symbolism": "Represents speed, freedom, and nobility"},
+    {"Deva": "🛡️ Āryaman", "Type": "☀️ Āditya", "Chakra": "🟡 Maṇipūra", "Element": "🌞 Solar Dignity", "Vāhana": "-", "Bīja": "-", "Description": "Upholder of honor and nobility, radiating dignified energy", "Vahana_Symbolism": "No specific Vahana"},
+    {"Deva": "💰 Bhaga", "Type": "☀️ Āditya", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "🪙 Abundance", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Bhagāya Namaḥ", "Description": "Bestower of prosperity, symbolizing wealth and strength", "Vahana_Symbolism": "Symbolizes strength and courage"},
+    {"Deva": "🌗 Aṃśa", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "🥛 Soma-share", "Vāhana": "-", "Bīja": "-", "Description": "Distributor of divine nectar, fostering spiritual insight", "Vahana_Symbolism": "No specific Vahana"},
+    {"Deva": "🛠️ Tvaṣṭṛ", "Type": "☀️ Āditya", "Chakra": "🔴 Mūlādhāra", "Element": "🧱 Creation", "Vāhana": "🐘 Elephant", "Bīja": "🕉️ Om Tvaṣṭre Namaḥ", "Description": "Divine craftsman, shaping creation with grounded wisdom", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
+    {"Deva": "☀️ Savitṛ", "Type": "☀️ Āditya", "Chakra": "⚪ Sahasrāra", "Element": "🌅 Solar Radiance", "Vāhana": "🌟 Golden Chariot", "Bīja": "🕉️ Tat Savitur Vareṇyam...", "Description": "Inspirer of enlightenment, radiating divine light", "Vahana_Symbolism": "Symbolizes the journey toward enlightenment"},
+    {"Deva": "🧭 Pūṣan", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "🛤️ Guidance", "Vāhana": "🐐 Goat", "Bīja": "🕉️ Om Pūṣṇe Namaḥ", "Description": "Guide of travelers, illuminating paths with intuition", "Vahana_Symbolism": "Represents sure-footedness and guidance"},
+    {"Deva": "📏 Dakṣa", "Type": "☀️ Āditya", "Chakra": "🟣 Ājñā", "Element": "📐 Order", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Dakṣāya Namaḥ", "Description": "Master of cosmic order, ensuring balance and clarity", "Vahana_Symbolism": "Symbolizes strength and courage"},
+    {"Deva": "☀️ Vivasvān", "Type": "☀️ Āditya", "Chakra": "⚪ Sahasrāra", "Element": "🔆 Light", "Vāhana": "🐎 Seven-Horse Chariot", "Bīja": "🕉️ Om Sūryāya Namaḥ", "Description": "Source of universal light, driving spiritual awakening", "Vahana_Symbolism": "Represents life-giving energy and movement"},
+    {"Deva": "⚡ Indra", "Type": "☀️ Āditya", "Chakra": "🟡 Maṇipūra", "Element": "🔥 Energy", "Vāhana": "🐘 Airāvata", "Bīja": "🕉️ Om Indrāya Namaḥ", "Description": "King of gods, wielding thunderous energy and courage", "Vahana_Symbolism": "Represents wisdom, power, and royalty"},
+    {"Deva": "🛡️ Viṣṇu", "Type": "☀️ Āditya", "Chakra": "🌈 All", "Element": "🛡️ Preserver", "Vāhana": "🦅 Garuḍa", "Bīja": "🕉️ Om Namo Nārāyaṇāya", "Description": "Preserver of the universe, harmonizing all energies", "Vahana_Symbolism": "Symbolizes speed and martial prowess"},
+    {"Deva": "🔱 Śiva", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "🌀 Destruction/Transformation", "Vāhana": "🐂 Bull (Nandi)", "Bīja": "🕉️ Om Namaḥ Śivāya", "Description": "Transformer of existence, guiding profound change", "Vahana_Symbolism": "Represents strength, fertility, and dharma"},
+    {"Deva": "🔥 Manyu", "Type": "🌪️ Rudra", "Chakra": "🟡 Maṇipūra", "Element": "😠 Anger", "Vāhana": "🦁 Lion", "Bīja": "🕉️ Om Manyave Namaḥ", "Description": "Embodiment of fierce resolve, channeling intense energy", "Vahana_Symbolism": "Symbolizes strength and courage"},
+    {"Deva": "🐯 Ugra", "Type": "🌪️ Rudra", "Chakra": "🔴 Mūlādhāra", "Element": "💪 Fierce Will", "Vāhana": "🐅 Tiger", "Bīja": "🕉️ Om Ugrāya Namaḥ", "Description": "Fierce warrior, grounding strength with determination", "Vahana_Symbolism": "Represents ferocity and power"},
+    {"Deva": "📣 Bhīma", "Type": "🌪️ Rudra", "Chakra": "🟦 Viśuddha", "Element": "📢 Roar", "Vāhana": "🐘 Elephant", "Bīja": "-", "Description": "Resonator of mighty voice, amplifying expression", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
+    {"Deva": "🌀 Kapardī", "Type": "🌪️ Rudra", "Chakra": "⚪ Sahasrāra", "Element": "🔥 Tapas", "Vāhana": "🐂 Bull", "Bīja": "-", "Description": "Ascetic of divine focus, igniting spiritual fire", "Vahana_Symbolism": "Represents strength, fertility, and dharma"},
+    {"Deva": "🌟 Raivata", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "✨ Radiance", "Vāhana": "🦌 Deer", "Bīja": "-", "Description": "Bearer of radiant insight, illuminating wisdom", "Vahana_Symbolism": "Represents gentleness and swiftness"},
+    {"Deva": "🐍 Sarpī", "Type": "🌪️ Rudra", "Chakra": "🔴 Mūlādhāra", "Element": "🐉 Kundalinī", "Vāhana": "🐍 Serpent", "Bīja": "🕉️ Saṃ", "Description": "Awakener of kundalini, rooted in primal energy", "Vahana_Symbolism": "Symbolizes transformation and healing"},
+    {"Deva": "⚡ Vijra", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "🎯 Focus", "Vāhana": "🦅 Lightning Bird", "Bīja": "-", "Description": "Sharpened focus, striking with divine precision", "Vahana_Symbolism": "Symbolizes speed and power"},
+    {"Deva": "🌩️ Āśani", "Type": "🌪️ Rudra", "Chakra": "🟣 Ājñā", "Element": "⚡ Thunderbolt", "Vāhana": "☁️ Thundercloud", "Bīja": "-", "Description": "Wielder of thunder, sparking transformative insight", "Vahana_Symbolism": "Symbolizes storm energy and transformation"},
+    {"Deva": "🌌 Mahān", "Type": "🌪️ Rudra", "Chakra": "⚪ Sahasrāra", "Element": "🌠 Greatness", "Vāhana": "🌠 Cosmic Mount", "Bīja": "-", "Description": "Embodiment of cosmic greatness, transcending limits", "Vahana_Symbolism": "Symbolizes transcendence and universality"},
+    {"Deva": "🌿 Ṛtudhvaja", "Type": "🌪️ Rudra", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "🌸 Cycle/Season", "Vāhana": "🛞 Chariot of Seasons", "Bīja": "-", "Description": "Ruler of seasonal cycles, flowing with nature’s rhythm", "Vahana_Symbolism": "Symbolizes cyclical time and harmony"},
+    {"Deva": "🌊 Āpaḥ", "Type": "🪨 Vasu", "Chakra": "🧡 Svādhiṣṭhāna", "Element": "💧 Water", "Vāhana": "🐢 Turtle", "Bīja": "🕉️ Om Āpaḥ Svaḥ", "Description": "Essence of life-giving water, nurturing fluidity", "Vahana_Symbolism": "Represents longevity and stability"},
+    {"Deva": "🧭 Dhruva", "Type": "🪨 Vasu", "Chakra": "⚪ Sahasrāra", "Element": "🧘 Stillness", "Vāhana": "🌌 Pole Star", "Bīja": "🪷 Dhruva Stuti", "Description": "Symbol of unwavering stillness, guiding eternal focus", "Vahana_Symbolism": "Represents steadfastness and guidance"},
+    {"Deva": "🌙 Soma", "Type": "🪨 Vasu", "Chakra": "🟣 Ājñā", "Element": "🥛 Moon Nectar", "Vāhana": "🦌 Deer", "Bīja": "🕉️ Om Somāya Namaḥ", "Description": "Bearer of divine nectar, soothing with lunar calm", "Vahana_Symbolism": "Represents gentleness and swiftness"},
+    {"Deva": "🌍 Dhara", "Type": "🪨 Vasu", "Chakra": "🔴 Mūlādhāra", "Element": "🌎 Earth", "Vāhana": "🐘 Elephant", "Bīja": "🕉️ Om Dhārayantyai Namaḥ", "Description": "Sustainer of earth, grounding with steadfast support", "Vahana_Symbolism": "Represents wisdom, power, and stability"},
+    {"Deva": "💨 Anila", "Type": "🪨 Vasu", "Chakra": "💚 Anāhata", "Element": "🌬️ Air", "Vāhana": "🦌 Deer", "Bīja": "🕉️ Om Anilāya Namaḥ", "Description": "Breath of life, moving with airy grace", "Vahana_Symbolism": "Represents gentleness and swiftness"},
+    {"Deva": "🔥 Anala", "Type": "🪨 Vasu", "Chakra": "🟡 Maṇipūra", "Element": "🔥 Fire", "Vāhana": "🐏 Ram", "Bīja": "🕉️ Om Agnaye Namaḥ", "Description": "Flame of transformation, burning with inner power", "Vahana_Symbolism": "Represents leadership and sacrifice"},
+    {"Deva": "🌅 Pratyūṣa", "Type": "🪨 Vasu", "Chakra": "🟦 Viśuddha", "Element": "🌄 Dawn", "Vāhana": "🐎 Golden Horse", "Bīja": "-", "Description": "Herald of dawn, awakening vibrant expression", "Vahana_Symbolism": "Represents new beginnings and vitality"},
+    {"Deva": "💡 Prabhāsa", "Type": "🪨 Vasu", "Chakra": "⚪ Sahasrāra", "Element": "💫 Radiance", "Vāhana": "🦚 Peacock", "Bīja": "-", "Description": "Source of radiant brilliance, illuminating divinity", "Vahana_Symbolism": "Symbolizes beauty and immortality"},
+    {"Deva": "🌬️ Nāṣatya", "Type": "👬 Aśvin", "Chakra": "🌀 Iḍā", "Element": "🌬️ Breath (Left)", "Vāhana": "🐎 Horse", "Bīja": "🕉️ Om Nāsatye Namaḥ", "Description": "Healer of lunar breath, restoring balance", "Vahana_Symbolism": "Represents speed, freedom, and nobility"},
+    {"Deva": "💪 Dasra", "Type": "👬 Aśvin", "Chakra": "🔥 Piṅgalā", "Element": "🔋 Vitality (Right)", "Vāhana": "🐎 Horse", "Bīja": "🕉️ Om Dasrāya Namaḥ", "Description": "Energizer of solar vitality, igniting strength", "Vahana_Symbolism": "Represents speed, freedom, and nobility"}
+]
+# Standardize chakra names
+chakra_name_map = {
+    'Mūlādhāra': 'Muladhara',
+    'Svādhiṣṭhāna': 'Svadhisthana',
+    'Maṇipūra': 'Manipura',
+    'Anāhata': 'Anahata',
+    'Viśuddha': 'Vishuddha',
+    'Ājñā': 'Ajna',
+    'Sahasrāra': 'Sahasrara',
+    'Iḍā': 'Ida',
+    'Piṅgalā': 'Pingala',
+    'All': 'All'
+}
+# Order in which chakra counts are reported
+chakra_order = ['Muladhara', 'Svadhisthana', 'Manipura', 'Anahata', 'Vishuddha', 'Ajna']
+
+# Standardized chakra name for a deva record, e.g. '🟣 Ājñā' -> 'Ajna'
+def deva_chakra_name(deva):
+    name = deva['Chakra'].split()[-1]
+    return chakra_name_map.get(name, name)
+
+# Map extracted consonants to (letter, chakra) pairs
+def map_consonants(cons):
+    consonants_with_chakras = []
+    for con in cons:
+        key = con + 'a'
+        if key in chakra_mappings:
+            consonants_with_chakras.append((key, chakra_mappings[key]))
+        else:
+            # Try lowercase/uppercase adjustment if not found (rare)
+            key_lower = con.lower() + 'a'
+            if key_lower in chakra_mappings:
+                consonants_with_chakras.append((key_lower, chakra_mappings[key_lower]))
+    return consonants_with_chakras
+
+# Score an ITRANS string: chakra counts, vowel count and dominant chakra(s)
+def score_itrans(itrans_name):
+    with timed('extract_phonemes'):
+        cons, vows = extract_phonemes(itrans_name)
+    consonants_with_chakras = map_consonants(cons)
+    vowel_count = sum(1 for char in vows if char in vowels)
+    chakra_counts = {chakra: 0 for chakra in chakra_order}
+    for _, chakra in consonants_with_chakras:
+        chakra_counts[chakra] += 1
+    max_count = max(chakra_counts.values())
+    dominant_chakras = [chakra for chakra, count in chakra_counts.items() if count == max_count and count > 0]
+    dominant_chakra = dominant_chakras[0] if dominant_chakras else 'Vishuddha' if vowel_count > 0 else None
+    return {
+        'consonants': consonants_with_chakras,
+        'vowel_count': vowel_count,
+        'chakra_counts': chakra_counts,
+        'max_count': max_count,
+        'dominant_chakras': dominant_chakras,
+        'dominant_chakra': dominant_chakra,
+    }
+
+# Devanagari -> ITRANS tables built once from indic_transliteration's own scheme data:
+# consonants (which take the implicit 'a' unless followed by a vowel mark or virama),
+# their suffixes, and every other Devanagari token. Matching them longest-first in a
+# single pass reproduces sanscript.transliterate(name, DEVANAGARI, ITRANS) exactly.
+@lru_cache(maxsize=1)
+def _devanagari_itrans_tables():
+    from indic_transliteration.sanscript import SCHEMES, DEVANAGARI, ITRANS, SchemeMap
+    if "shortcuts" in SCHEMES[DEVANAGARI] or "shortcuts" in SCHEMES[ITRANS]:
+        return None
+    mapping = SchemeMap(SCHEMES[DEVANAGARI], SCHEMES[ITRANS])
+    consonants = {token: itrans for token, itrans in mapping.non_marks_viraama.items() if token in mapping.consonants}
+    suffixes = dict(mapping.vowel_marks, **mapping.virama)
+    others = {token: itrans for token, itrans in mapping.non_marks_viraama.items() if token not in mapping.consonants}
+    others.update(suffixes)
+    others.pop('', None)
+    token_re = re.compile(f"({_alternation(consonants)})({_alternation(suffixes)})?|({_alternation(others)}|.)", re.DOTALL)
+    # Vedic accents are moved in front of a preceding yogavaaha, as the library does
+    accent_re = None
+    if mapping.accents:
+        accent_re = re.compile("([%s])([%s])" % ("".join(SCHEMES[DEVANAGARI]['yogavaahas']), "".join(mapping.accents)))
+    return token_re, consonants, suffixes, others, accent_re
+
+# Transliterate Devanagari to ITRANS in a single table-driven pass
+def devanagari_to_itrans(devanagari_name):
+    tables = _devanagari_itrans_tables()
+    if tables is None:
+        from indic_transliteration.sanscript import transliterate
+        return transliterate(devanagari_name, 'devanagari', 'itrans')
+    token_re, consonants, suffixes, others, accent_re = tables
+    if accent_re is not None:
+        devanagari_name = accent_re.sub(r"\2\1", devanagari_name)
+    itrans = []
+    for consonant, suffix, other in token_re.findall(devanagari_name):
+        if consonant:
+            itrans.append(consonants[consonant])
+            itrans.append(suffixes[suffix] if suffix else 'a')
+        else:
+            itrans.append(others.get(other, other))
+    return ''.join(itrans)
+
+# Convert an input to (devanagari_name, itrans_name); returns None for Devanagari mode
+# input that contains no Devanagari characters. Latin input is transliterated once, to
+# Devanagari, and the ITRANS form used for phoneme matching is derived from that.
+def prepare_name(name_input, scheme="ITRANS", english_mode=False, devanagari=False):
+    if devanagari:
+        if not any('\u0900' <= char <= '\u097F' for char in name_input):
+            return None
+        return name_input, devanagari_to_itrans(name_input)
+    # Imported on first use to keep module import (and app start-up) light
+    from indic_transliteration.sanscript import transliterate
+    source = preprocess_input(name_input) if english_mode else name_input
+    devanagari_name = transliterate(source, scheme_map[scheme], 'devanagari')
+    # An ITRANS '_' separates letters that would otherwise join (g_h is g + h, not gh) and
+    # has no Devanagari form, so such input is matched in its direct ITRANS form
+    if scheme_map[scheme] == 'itrans' and '_' in source:
+        return devanagari_name, transliterate(source, 'itrans', 'itrans')
+    return devanagari_name, devanagari_to_itrans(devanagari_name)
+
+# Full analysis of a name or phrase.
+# status is 'ok', 'no_phonemes' or 'invalid_devanagari'; prose is only built for 'ok'.
+def analyze_name(name_input, scheme="ITRANS", english_mode=False, devanagari=False, with_prose=True):
+    with timed('transliterate'):
+        prepared = prepare_name(name_input, scheme, english_mode, devanagari)
+    if prepared is None:
+        count('analysis_invalid_devanagari')
+        return {'input': name_input, 'devanagari': name_input, 'status': 'invalid_devanagari'}
+    devanagari_name, itrans_name = prepared
+    with timed('score'):
+        result = score_itrans(itrans_name)
+    result['input'] = name_input
+    result['devanagari'] = devanagari_name
+    if not result['consonants'] and not result['vowel_count']:
+        count('analysis_no_phonemes')
+        result['status'] = 'no_phonemes'
+        return result
+    count('analysis_ok')
+    result['status'] = 'ok'
+    if with_prose:
+        with timed('prose'):
+            result['prose'] = build_prose(result)
+    return result
+
+# Generate dynamic prose for an analysis result
+def build_prose(result):
+    devanagari_name = result['devanagari']
+    consonants_with_chakras = result['consonants']
+    vowel_count = result['vowel_count']
+    max_count = result['max_count']
+    dominant_chakras = result['dominant_chakras']
+    dominant_chakra = result['dominant_chakra']
+    prose = []
+    if max_count > 0:
+        dominant_letters = [char for char, chakra in consonants_with_chakras if chakra == dominant_chakra]
+        prose.append(f"For the name or phrase **{devanagari_name}**, the dominant chakra is **{dominant_chakra}** {bhava_rasa_mappings[dominant_chakra]['emoji']}, activated by the letters {', '.join(dominant_letters)}, which {bhava_rasa_mappings[dominant_chakra]['description']}.")
+        if len(dominant_chakras) > 1:
+            other_chakras = dominant_chakras[1:]
+            other_texts = [f"{chakra} {bhava_rasa_mappings[chakra]['emoji']} (letters {', '.join([char for char, chakra_ in consonants_with_chakras if chakra_ == chakra])})" for chakra in other_chakras]
+            prose.append(f"Additionally, the chakras {', '.join(other_texts)} are equally prominent, bringing their unique energies.")
+        prose.append(f"The dominant emotion is **{bhava_rasa_mappings[dominant_chakra]['bhava']}** {bhava_rasa_mappings[dominant_chakra]['bhava_emoji']}, evoking the **{bhava_rasa_mappings[dominant_chakra]['rasa']}** feeling {bhava_rasa_mappings[dominant_chakra]['rasa_emoji']}, embodying its essence.")
+        prose.append(f"This vibrant energy aligns with the element **{bhava_rasa_mappings[dominant_chakra]['element']}**, symbolizing its core qualities.")
+
+        # Add Deva descriptions, pre-rendered per chakra in the reference bundle
+        from chakra_bundle import chakra_deva_prose
+        deva_text = chakra_deva_prose(dominant_chakra)
+        if deva_text:
+            prose.append(deva_text)
+    if vowel_count > 0:
+        prose.append(f"Moreover, the {vowel_count} vowel{'s' if vowel_count > 1 else ''} activate the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, enhancing communication and self-expression.")
+    if max_count == 0 and vowel_count > 0:
+        prose = [f"The name or phrase **{devanagari_name}** consists only of vowels, primarily activating the **Vishuddha** chakra {bhava_rasa_mappings['Vishuddha']['emoji']}, which {bhava_rasa_mappings['Vishuddha']['description']}. The dominant emotion is **{bhava_rasa_mappings['Vishuddha']['bhava']}** {bhava_rasa_mappings['Vishuddha']['bhava_emoji']}, evoking the **{bhava_rasa_mappings['Vishuddha']['rasa']}** feeling {bhava_rasa_mappings['Vishuddha']['rasa_emoji']}, embodying its essence."]
+    return " ".join(prose)
+
+# Process-wide LRU cache of full analyses, shared by every session of the app, in front
+# of the optional on-disk cache (chakra_cache, enabled by CHAKRA_CACHE_PATH) shared by all
+# processes. Results are shared objects and must be treated as read-only.
+analysis_cache_size = int(os.environ.get('CHAKRA_ANALYSIS_CACHE_SIZE', 4096))
+
+@lru_cache(maxsize=analysis_cache_size)
+def cached_analysis(name_input, scheme="ITRANS", english_mode=False, devanagari=False):
+    # Imported on first use: chakra_cache hashes this module's reference data
+    from chakra_cache import shared_cache
+    disk_cache = shared_cache()
+    if disk_cache is None:
+        return analyze_name(name_input, scheme, english_mode, devanagari)
+    result = disk_cache.get(name_input, scheme, english_mode, devanagari)
+    if result is None:
+        result = analyze_name(name_input, scheme, english_mode, devanagari)
+        disk_cache.put(name_input, result, scheme, english_mode, devanagari)
+    return result
+
+# Hit/miss counters and occupancy of the analysis cache, plus the on-disk cache's
+# counters under 'disk' when it is enabled
+def cache_stats():
+    info = cached_analysis.cache_info()
+    stats = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+    from chakra_cache import shared_cache
+    disk_cache = shared_cache()
+    if disk_cache is not None:
+        stats['disk'] = dict(disk_cache.stats, max_entries=disk_cache.max_entries)
+    return stats
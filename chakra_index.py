@@ -0,0 +1,205 @@
+import json
+import os
+import numpy as np
+from chakra_engine import chakra_order, cached_analysis
+from chakra_scoring import vowel_id, chakra_ids, score_histograms, dominant_column
+from chakra_results import status_ids
+
+# On-disk layout: a directory with meta.json and one raw little-endian file per column,
+# opened with np.memmap so queries touch only the pages they need. Names are grouped by
+# identical chakra + vowel histograms; a corpus of millions of names has only a few
+# thousand distinct histograms, so queries scan the groups and then read the members.
+index_format = 1
+index_columns = {
+    'name_data': 'u1',        # UTF-8 names, back to back
+    'name_offsets': '<i8',    # start of each name in name_data, plus the end
+    'name_group': '<i4',      # group of each name
+    'group_hist': '<u2',      # (groups, 7) chakra + vowel counts, capped at 65535
+    'group_members': '<i4',   # names ordered by group
+    'group_offsets': '<i8',   # start of each group in group_members, plus the end
+}
+# Count columns that can be filtered on: chakra_order plus the vowel count. Similarity
+# profiles use the chakras only, since nearly every name has vowels.
+count_keys = chakra_order + ['Vowels']
+
+def _column_path(path, column):
+    return os.path.join(path, f"{column}.bin")
+
+# Distinct histogram rows and the row index of each input row. Counts below 512 are
+# packed 9 bits each into one int64 key, which sorts much faster than whole rows.
+def _unique_rows(hist):
+    if hist.size and hist.max() >= 512:
+        group_hist, inverse = np.unique(hist, axis=0, return_inverse=True)
+        return group_hist, inverse.reshape(-1).astype('<i4')
+    shifts = np.arange(hist.shape[1], dtype=np.int64) * 9
+    keys, inverse = np.unique((hist.astype(np.int64) << shifts).sum(axis=1), return_inverse=True)
+    return (keys[:, None] >> shifts) & 511, inverse.astype('<i4')
+
+# Streams analysed ResultBlocks into an index directory; only names with status 'ok' are kept
+class IndexWriter:
+    def __init__(self, path, options=None):
+        self.path = path
+        self.options = options or {}
+        os.makedirs(path, exist_ok=True)
+        # A rebuilt index only becomes loadable again once it is complete
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        self.files = {column: open(_column_path(path, column), 'wb') for column in ('name_data', 'name_offsets', 'hist')}
+        self.count = 0
+        self.name_bytes = 0
+        self.files['name_offsets'].write(np.zeros(1, dtype='<i8').tobytes())
+
+    def add_block(self, block):
+        keep = np.flatnonzero(block.status == status_ids['ok'])
+        if not len(keep):
+            return
+        data, offsets = block.names
+        names = data.tobytes()
+        name_data = b''.join(names[offsets[i]:offsets[i + 1]] for i in keep.tolist())
+        name_offsets = self.name_bytes + np.cumsum(offsets[keep + 1] - offsets[keep], dtype='<i8')
+        self.files['name_data'].write(name_data)
+        self.files['name_offsets'].write(name_offsets.tobytes())
+        self.files['hist'].write(np.minimum(block.hist[keep].astype(np.int64), 0xFFFF).astype('<u2').tobytes())
+        self.count += len(keep)
+        self.name_bytes += len(name_data)
+
+    # Group the names by histogram, then write meta.json last so a half-written index is never loaded
+    def close(self, complete=True):
+        for f in self.files.values():
+            f.close()
+        hist_path = _column_path(self.path, 'hist')
+        if not complete:
+            os.remove(hist_path)
+            return
+        hist = np.fromfile(hist_path, dtype='<u2').reshape(-1, vowel_id + 1)
+        group_hist, name_group = _unique_rows(hist)
+        group_offsets = np.zeros(len(group_hist) + 1, dtype='<i8')
+        np.cumsum(np.bincount(name_group, minlength=len(group_hist)), out=group_offsets[1:])
+        columns = {
+            'name_group': name_group,
+            'group_hist': group_hist.astype('<u2'),
+            'group_members': np.argsort(name_group, kind='stable').astype('<i4'),
+            'group_offsets': group_offsets,
+        }
+        for column, array in columns.items():
+            array.tofile(_column_path(self.path, column))
+        os.remove(hist_path)
+        meta = dict(self.options, format=index_format, count=self.count, groups=len(group_hist))
+        with open(os.path.join(self.path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=1)
+
+# Build an index directory from an iterable of ResultBlocks; returns the number of names indexed
+def build_index(path, blocks, options=None):
+    writer = IndexWriter(path, options)
+    try:
+        for block in blocks:
+            writer.add_block(block)
+    except BaseException:
+        writer.close(complete=False)
+        raise
+    writer.close()
+    return writer.count
+
+# Turn a profile such as {'Anahata': 3, 'Ajna': 1} into a unit vector over chakra_order
+def profile_vector(profile):
+    vector = np.zeros(len(chakra_order), dtype=np.float32)
+    for key, weight in profile.items():
+        if key not in chakra_ids:
+            raise ValueError(f"Unknown chakra '{key}'. Choose from: {', '.join(chakra_order)}.")
+        vector[chakra_ids[key]] = weight
+    norm = np.linalg.norm(vector)
+    if not norm:
+        raise ValueError("A profile needs at least one non-zero weight.")
+    return vector / norm
+
+# Read-only, memory-mapped view of an index directory. The per-group histograms,
+# normalized profiles and dominant chakras are small and held in memory.
+class ChakraIndex:
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != index_format:
+            raise ValueError(f"Unsupported index format {self.meta.get('format')}; rebuild the index.")
+        self.count = self.meta['count']
+        self.columns = {}
+        for column, dtype in index_columns.items():
+            file_path = _column_path(path, column)
+            # np.memmap cannot map empty files (an index without names)
+            self.columns[column] = np.memmap(file_path, dtype=dtype, mode='r') if os.path.getsize(file_path) else np.zeros(0, dtype=dtype)
+        self.group_hist = np.array(self.columns['group_hist']).reshape(-1, vowel_id + 1)
+        self.group_offsets = np.array(self.columns['group_offsets'])
+        self.group_sizes = np.diff(self.group_offsets)
+        self.group_dominant = score_histograms(self.group_hist)[:, dominant_column]
+        profiles = self.group_hist[:, :vowel_id].astype(np.float32)
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        self.group_profiles = np.divide(profiles, norms, out=np.zeros_like(profiles), where=norms > 0)
+
+    def __len__(self):
+        return self.count
+
+    def name(self, i):
+        offsets = self.columns['name_offsets']
+        return self.columns['name_data'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    # Result row for index position i, with an optional similarity score
+    def entry(self, i, similarity=None):
+        group = int(self.columns['name_group'][i])
+        counts = self.group_hist[group].tolist()
+        dominant = int(self.group_dominant[group])
+        entry = {
+            'name': self.name(i),
+            'chakra_counts': dict(zip(chakra_order, counts)),
+            'vowel_count': counts[vowel_id],
+            'dominant_chakra': chakra_order[dominant] if dominant >= 0 else None,
+        }
+        if similarity is not None:
+            entry['similarity'] = float(similarity)
+        return entry
+
+    # Boolean mask of groups whose dominant chakra is `dominant` (any if None) and that
+    # contain at least min_count phonemes of every chakra in `containing`
+    def group_mask(self, dominant=None, containing=(), min_count=1):
+        mask = np.ones(len(self.group_hist), dtype=bool)
+        if dominant:
+            mask &= self.group_dominant == chakra_ids[dominant]
+        for chakra in containing:
+            mask &= self.group_hist[:, count_keys.index(chakra)] >= min_count
+        return mask
+
+    # Entries for the members of `groups` in order, up to limit names
+    def _members(self, groups, limit, similarity=None):
+        entries = []
+        members = self.columns['group_members']
+        for group in groups.tolist():
+            start, end = self.group_offsets[group], self.group_offsets[group + 1]
+            score = similarity[group] if similarity is not None else None
+            entries.extend(self.entry(i, score) for i in members[start:min(end, start + limit - len(entries))].tolist())
+            if len(entries) >= limit:
+                break
+        return entries
+
+    # Names matching the filters, grouped by identical histograms
+    def filter(self, dominant=None, containing=(), min_count=1, limit=100):
+        return self._members(np.flatnonzero(self.group_mask(dominant, containing, min_count)), limit)
+
+    # Count of names matching the filters
+    def count_matching(self, dominant=None, containing=(), min_count=1):
+        return int(self.group_sizes[self.group_mask(dominant, containing, min_count)].sum())
+
+    # The k names whose normalized chakra profiles are closest (cosine similarity) to
+    # `profile`, a dict of chakra -> weight, optionally restricted by the same filters
+    def nearest(self, profile, k=10, dominant=None, containing=(), min_count=1):
+        similarity = self.group_profiles @ profile_vector(profile)
+        groups = np.flatnonzero(self.group_mask(dominant, containing, min_count))
+        groups = groups[np.argsort(-similarity[groups], kind='stable')]
+        return self._members(groups, k, similarity)
+
+    # Names with a chakra profile like that of `name`, analysed with the index's options
+    def similar_to(self, name, k=10, **filters):
+        result = cached_analysis(name, self.meta.get('scheme', "ITRANS"), self.meta.get('english_mode', False), self.meta.get('devanagari', False))
+        if result['status'] != 'ok':
+            raise ValueError(f"'{name}' has no Sanskrit phonemes to compare.")
+        if not result['max_count']:
+            raise ValueError(f"'{name}' has only vowels; search by dominant chakra instead.")
+        return self.nearest(result['chakra_counts'], k, **filters)
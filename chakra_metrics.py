@@ -0,0 +1,152 @@
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Opt-in: set CHAKRA_METRICS=1 to record stage timings. When disabled, timed() returns a
+# shared no-op context manager so instrumented code pays almost nothing.
+enabled = os.environ.get('CHAKRA_METRICS', '') not in ('', '0')
+# Optional Prometheus textfile target, rewritten at most every export_interval seconds
+export_path = os.environ.get('CHAKRA_METRICS_FILE')
+export_interval = float(os.environ.get('CHAKRA_METRICS_INTERVAL', 10))
+
+# Histogram bucket upper bounds, in seconds
+buckets = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_last_export = 0.0
+# Per-analysis trace (stage -> seconds) for the current thread/task, if one is active
+_trace = contextvars.ContextVar('chakra_trace', default=None)
+
+class _Timer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+_null_timer = contextlib.nullcontext()
+
+# Time a block as one stage: `with timed('prose'): ...`
+def timed(stage):
+    return _Timer(stage) if enabled else _null_timer
+
+# Record one stage duration in the process-wide histogram and the active trace
+def observe(stage, seconds):
+    if not enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+        histogram['buckets'][bisect_left(buckets, seconds)] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+    trace = _trace.get()
+    if trace is not None:
+        trace[stage] = trace.get(stage, 0.0) + seconds
+
+# Increment an event counter
+def count(event, n=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + n
+
+# Collect the stage durations of everything run inside the block into a dict
+@contextlib.contextmanager
+def trace():
+    if not enabled:
+        yield {}
+        return
+    stages = {}
+    token = _trace.set(stages)
+    try:
+        yield stages
+    finally:
+        _trace.reset(token)
+
+# Copy of the aggregated histograms and counters
+def snapshot():
+    with _lock:
+        return {
+            'histograms': {stage: {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']} for stage, h in _histograms.items()},
+            'counters': dict(_counters),
+        }
+
+# What was recorded between two snapshots of the same process (after minus before)
+def snapshot_delta(before, after):
+    histograms = {}
+    for stage, h in after['histograms'].items():
+        old = before['histograms'].get(stage, {'buckets': [0] * len(h['buckets']), 'sum': 0.0, 'count': 0})
+        if h['count'] != old['count']:
+            histograms[stage] = {'buckets': [n - m for n, m in zip(h['buckets'], old['buckets'])], 'sum': h['sum'] - old['sum'], 'count': h['count'] - old['count']}
+    counters = {event: n - before['counters'].get(event, 0) for event, n in after['counters'].items() if n != before['counters'].get(event, 0)}
+    return {'histograms': histograms, 'counters': counters}
+
+# Add metrics recorded elsewhere (e.g. a snapshot_delta from a worker process) to this process'
+def merge(data):
+    if not enabled:
+        return
+    with _lock:
+        for stage, h in data['histograms'].items():
+            histogram = _histograms.get(stage)
+            if histogram is None:
+                histogram = _histograms[stage] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'] = [n + m for n, m in zip(histogram['buckets'], h['buckets'])]
+            histogram['sum'] += h['sum']
+            histogram['count'] += h['count']
+        for event, n in data['counters'].items():
+            _counters[event] = _counters.get(event, 0) + n
+
+# Aggregated metrics in the Prometheus text exposition format; extra_counters are
+# exported alongside the recorded events (e.g. cache hits)
+def prometheus_text(extra_counters=None):
+    data = snapshot()
+    counters = dict(data['counters'], **(extra_counters or {}))
+    lines = [
+        "# HELP chakra_stage_duration_seconds Time spent in each name analysis stage.",
+        "# TYPE chakra_stage_duration_seconds histogram",
+    ]
+    for stage, histogram in sorted(data['histograms'].items()):
+        cumulative = 0
+        for bound, n in zip(buckets + (float('inf'),), histogram['buckets']):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'chakra_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+        lines.append(f'chakra_stage_duration_seconds_sum{{stage="{stage}"}} {histogram["sum"]}')
+        lines.append(f'chakra_stage_duration_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+    lines.append("# HELP chakra_events_total Name analysis events.")
+    lines.append("# TYPE chakra_events_total counter")
+    for event, n in sorted(counters.items()):
+        lines.append(f'chakra_events_total{{event="{event}"}} {n}')
+    return '\n'.join(lines) + '\n'
+
+# Atomically write the Prometheus text to a file (e.g. for node_exporter's textfile collector)
+def write_prometheus(path, extra_counters=None):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(extra_counters))
+    os.replace(tmp_path, path)
+
+# Write CHAKRA_METRICS_FILE if configured and the export interval has passed
+def maybe_export(extra_counters=None):
+    global _last_export
+    if not enabled or not export_path:
+        return
+    now = time.monotonic()
+    if now - _last_export < export_interval:
+        return
+    _last_export = now
+    write_prometheus(export_path, extra_counters)
@@ -0,0 +1,242 @@
+import sys
+import numpy as np
+from chakra_engine import base_consonants, vowels_list, chakra_order, analyze_name
+from chakra_scoring import vowel_id, prepare_batch, batch_histograms, score_histograms, max_column, dominant_column, ties_column
+
+# Interned codes. Phonemes are numbered in phoneme_vocab (a consonant with or without its
+# vowel mark, or a lone vowel; base_consonants repeats some letters, which appear once here);
+# statuses and chakras by their position in these lists.
+phoneme_vocab = [sys.intern(con + matra) for con in dict.fromkeys(base_consonants) for matra in [''] + vowels_list] + [sys.intern(vowel) for vowel in vowels_list]
+phoneme_ids = {phoneme: i for i, phoneme in enumerate(phoneme_vocab)}
+statuses = ['ok', 'no_phonemes', 'invalid_devanagari', 'empty', 'error']
+status_ids = {status: i for i, status in enumerate(statuses)}
+# Labels of the dominant chakra codes (chakra id + 1, 0 when nothing scored) and tie bitmasks
+dominant_labels = [''] + chakra_order
+ties_labels = ['|'.join(chakra for i, chakra in enumerate(chakra_order) if mask >> i & 1) for mask in range(1 << len(chakra_order))]
+
+_no_phoneme = -1
+_separator_phoneme = -2
+
+# Phoneme id of every token of chakra_scoring's batch regex
+def _token_phoneme(token):
+    separator, con, matra, vowel = token
+    if separator:
+        return _separator_phoneme
+    if con:
+        return phoneme_ids[con + matra]
+    return phoneme_ids[vowel] if vowel else _no_phoneme
+
+# Pack strings into one UTF-8 buffer plus int32 offsets (the Arrow string layout)
+def _pack_strings(strings):
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+# Smallest unsigned dtype holding every count
+def _count_dtype(hist):
+    top = int(hist.max()) if hist.size else 0
+    return np.uint8 if top <= 0xFF else np.uint16 if top <= 0xFFFF else np.uint32
+
+# One analysed name: a view into a ResultBlock row, materialising fields on access
+class AnalysisResult:
+    __slots__ = ('block', 'index')
+
+    def __init__(self, block, index):
+        self.block = block
+        self.index = index
+
+    @property
+    def name(self):
+        return self.block.string('names', self.index)
+
+    @property
+    def devanagari(self):
+        return self.block.string('devanagari', self.index)
+
+    @property
+    def status(self):
+        return statuses[self.block.status[self.index]]
+
+    @property
+    def chakra_counts(self):
+        return dict(zip(chakra_order, self.block.hist[self.index, :vowel_id].tolist()))
+
+    @property
+    def vowel_count(self):
+        return int(self.block.hist[self.index, vowel_id])
+
+    @property
+    def max_count(self):
+        return int(self.block.hist[self.index, :vowel_id].max())
+
+    @property
+    def dominant_chakra(self):
+        return dominant_labels[self.block.dominant[self.index]] or None
+
+    @property
+    def dominant_chakras(self):
+        mask = int(self.block.ties[self.index])
+        return [chakra for i, chakra in enumerate(chakra_order) if mask >> i & 1]
+
+    @property
+    def phonemes(self):
+        offsets = self.block.phoneme_offsets
+        if offsets is None:
+            return None
+        return [phoneme_vocab[code] for code in self.block.phoneme_codes[offsets[self.index]:offsets[self.index + 1]].tolist()]
+
+    @property
+    def prose(self):
+        return self.block.prose[self.index] if self.block.prose is not None else None
+
+    # The result in the dict form of chakra_scoring.analyze_batch
+    def as_dict(self):
+        status = self.status
+        if status in ('empty', 'error'):
+            return {'status': status}
+        if status == 'invalid_devanagari':
+            return {'devanagari': self.devanagari, 'status': status}
+        result = {
+            'chakra_counts': self.chakra_counts,
+            'vowel_count': self.vowel_count,
+            'max_count': self.max_count,
+            'dominant_chakras': self.dominant_chakras,
+            'dominant_chakra': self.dominant_chakra,
+            'devanagari': self.devanagari,
+            'status': status,
+        }
+        if self.prose:
+            result['prose'] = self.prose
+        return result
+
+# Columnar results for a batch of names: names and Devanagari forms as UTF-8 buffers with
+# offsets, int8 status/dominant/tie codes, an (n, 7) column-major histogram of chakra +
+# vowel counts in the smallest unsigned dtype, and optionally the phoneme sequences as
+# int16 codes with offsets. Indexing yields AnalysisResult views; to_arrow() wraps the arrays without copying.
+class ResultBlock:
+    __slots__ = ('names', 'devanagari', 'status', 'hist', 'dominant', 'ties', 'phoneme_codes', 'phoneme_offsets', 'prose')
+
+    def __init__(self, names, devanagari, status, hist, dominant, ties, phoneme_codes=None, phoneme_offsets=None, prose=None):
+        self.names = names
+        self.devanagari = devanagari
+        self.status = status
+        self.hist = hist
+        self.dominant = dominant
+        self.ties = ties
+        self.phoneme_codes = phoneme_codes
+        self.phoneme_offsets = phoneme_offsets
+        self.prose = prose
+
+    def __len__(self):
+        return len(self.status)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return AnalysisResult(self, index % len(self))
+
+    def __iter__(self):
+        return (AnalysisResult(self, i) for i in range(len(self)))
+
+    # Decode one packed string column entry
+    def string(self, column, index):
+        data, offsets = getattr(self, column)
+        return data[offsets[index]:offsets[index + 1]].tobytes().decode('utf-8')
+
+    # Bytes held by the block's arrays
+    @property
+    def nbytes(self):
+        arrays = [*self.names, *self.devanagari, self.status, self.hist, self.dominant, self.ties]
+        if self.phoneme_codes is not None:
+            arrays += [self.phoneme_codes, self.phoneme_offsets]
+        return sum(array.nbytes for array in arrays)
+
+    # Arrow table over the block's buffers. Strings, counts and phoneme codes are wrapped
+    # as-is; status and dominant chakras become dictionary columns over the code arrays.
+    def to_arrow(self):
+        import pyarrow as pa
+
+        def strings(column):
+            data, offsets = getattr(self, column)
+            return pa.StringArray.from_buffers(len(self), pa.py_buffer(offsets), pa.py_buffer(data))
+
+        def dictionary(indices, labels):
+            return pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(labels))
+
+        columns = {
+            'name': strings('names'),
+            'devanagari': strings('devanagari'),
+            'status': dictionary(self.status, statuses),
+        }
+        for i, chakra in enumerate(chakra_order):
+            columns[chakra] = pa.array(self.hist[:, i])
+        columns['vowels'] = pa.array(self.hist[:, vowel_id])
+        columns['dominant_chakra'] = dictionary(self.dominant, dominant_labels)
+        columns['dominant_chakras'] = dictionary(self.ties, ties_labels)
+        if self.phoneme_codes is not None:
+            columns['phonemes'] = pa.ListArray.from_arrays(pa.array(self.phoneme_offsets), dictionary(self.phoneme_codes, phoneme_vocab))
+        if self.prose is not None:
+            columns['prose'] = pa.array(self.prose, pa.string())
+        return pa.table(columns)
+
+    # One dict per name with chakra_cli.output_columns (plus prose), for CSV output
+    def rows(self):
+        names_data, names_offsets = self.names
+        devanagari_data, devanagari_offsets = self.devanagari
+        names = names_data.tobytes()
+        devanagari = devanagari_data.tobytes()
+        hist = self.hist.tolist()
+        for i, (status, counts, dominant, ties) in enumerate(zip(self.status.tolist(), hist, self.dominant.tolist(), self.ties.tolist())):
+            row = {
+                'name': names[names_offsets[i]:names_offsets[i + 1]].decode('utf-8'),
+                'devanagari': devanagari[devanagari_offsets[i]:devanagari_offsets[i + 1]].decode('utf-8'),
+                'status': statuses[status],
+            }
+            row.update(zip(chakra_order, counts))
+            row['vowels'] = counts[vowel_id]
+            row['dominant_chakra'] = dominant_labels[dominant]
+            row['dominant_chakras'] = ties_labels[ties]
+            if self.prose is not None:
+                row['prose'] = self.prose[i]
+            yield row
+
+# Analyse a batch of names with the same options into a ResultBlock. Phoneme sequences
+# are kept only if with_phonemes is set; prose, if requested, is the one part stored as
+# Python strings.
+def analyze_block(names, scheme="ITRANS", english_mode=False, devanagari=False, with_prose=False, with_phonemes=False):
+    n = len(names)
+    name_statuses, devanagari_names, scored, itrans_names = prepare_batch(names, scheme, english_mode, devanagari)
+    status = np.array([status_ids[s] if s else 0 for s in name_statuses], dtype=np.int8)
+    hist = np.zeros((n, vowel_id + 1), dtype=np.int64)
+    tokens = []
+    if itrans_names:
+        tokens, hist[scored] = batch_histograms(itrans_names)
+    scores = score_histograms(hist, dtype=np.int64)
+    status[scored] = np.where(scores[scored, max_column] + scores[scored, vowel_id] > 0, status_ids['ok'], status_ids['no_phonemes'])
+
+    phoneme_codes = phoneme_offsets = None
+    if with_phonemes:
+        ids = np.fromiter((_token_phoneme(token) for token in tokens), dtype=np.int16, count=len(tokens))
+        is_separator = ids == _separator_phoneme
+        rows = np.asarray(scored, dtype=np.int64)[np.cumsum(is_separator)] if len(ids) else np.zeros(0, dtype=np.int64)
+        keep = ids >= 0
+        phoneme_codes = ids[keep]
+        phoneme_offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows[keep], minlength=n), out=phoneme_offsets[1:])
+
+    prose = None
+    if with_prose:
+        prose = [analyze_name(name, scheme, english_mode, devanagari)['prose'] if s == status_ids['ok'] else '' for name, s in zip(names, status.tolist())]
+
+    return ResultBlock(
+        names=_pack_strings(names),
+        devanagari=_pack_strings(devanagari_names),
+        status=status,
+        hist=np.asfortranarray(hist, dtype=_count_dtype(hist)),
+        dominant=(scores[:, dominant_column] + 1).astype(np.int8),
+        ties=scores[:, ties_column].astype(np.int8),
+        phoneme_codes=phoneme_codes,
+        phoneme_offsets=phoneme_offsets,
+        prose=prose,
+    )
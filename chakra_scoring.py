@@ -0,0 +1,150 @@
+import re
+import numpy as np
+from chakra_engine import base_consonants, vowels_list, vowels, chakra_order, chakra_mappings, phoneme_pattern, prepare_name, analyze_name
+from chakra_metrics import timed
+
+# Chakra ids: 0-5 follow chakra_order, 6 counts Vishuddha vowels, 7 collects unmapped phonemes
+vowel_id = 6
+unmapped_id = 7
+chakra_ids = {chakra: i for i, chakra in enumerate(chakra_order)}
+
+# Columns of the score matrix returned by score_batch.
+# 'Dominant' is a chakra id (-1 when nothing scored); 'Ties' is a bitmask of every chakra
+# sharing the maximum consonant count (bit i for chakra_order[i]).
+score_columns = chakra_order + ['Vowels', 'Max', 'Dominant', 'Ties']
+max_column = 7
+dominant_column = 8
+ties_column = 9
+
+# Names are joined with this separator so a whole batch is tokenized in one regex pass
+_separator = '\x00'
+_separator_code = 16
+_batch_re = re.compile(f"({_separator})|{phoneme_pattern}", re.DOTALL)
+
+# Chakra id of a consonant, using the same key lookup as chakra_engine.map_consonants
+def _consonant_id(con):
+    for key in (con + 'a', con.lower() + 'a'):
+        if key in chakra_mappings:
+            return chakra_ids[chakra_mappings[key]]
+    return unmapped_id
+
+# Every token the batch regex can produce, encoded as consonant id (low 3 bits) plus
+# 8 when it carries a counted vowel
+def _build_token_codes():
+    consonant_ids = {con: _consonant_id(con) for con in base_consonants}
+    vowel_flags = {vowel: 8 if vowel in vowels else 0 for vowel in vowels_list}
+    codes = {(_separator, '', '', ''): _separator_code, ('', '', '', ''): unmapped_id}
+    for con, cid in consonant_ids.items():
+        codes[('', con, '', '')] = cid
+        for matra, flag in vowel_flags.items():
+            codes[('', con, matra, '')] = cid + flag
+    for vowel, flag in vowel_flags.items():
+        codes[('', '', '', vowel)] = unmapped_id + flag
+    return codes
+
+_token_codes = _build_token_codes()
+
+# Tokenize a batch of ITRANS strings in one regex pass; returns the tokens (separators
+# included) and an (n, 7) array of chakra + vowel counts per name
+def batch_histograms(itrans_names):
+    n = len(itrans_names)
+    # An embedded separator becomes a space, which is skipped like any unmatched character
+    text = _separator.join(name.replace(_separator, ' ') for name in itrans_names)
+    tokens = _batch_re.findall(text)
+    codes = np.fromiter((_token_codes[token] for token in tokens), dtype=np.uint8, count=len(tokens))
+    # Row of each token is the number of separators before it
+    is_separator = codes == _separator_code
+    rows = np.cumsum(is_separator)[~is_separator]
+    codes = codes[~is_separator]
+
+    hist = np.bincount(rows * 8 + (codes & 7), minlength=n * 8).reshape(n, 8)
+    hist[:, vowel_id] = np.bincount(rows[codes >= 8], minlength=n)
+    return tokens, hist[:, :vowel_id + 1]
+
+# Score a batch of ITRANS strings; returns an int32 matrix with one row per name and score_columns as columns
+def score_batch(itrans_names):
+    if not itrans_names:
+        return np.zeros((0, len(score_columns)), dtype=np.int32)
+    return score_histograms(batch_histograms(itrans_names)[1])
+
+# Derive max count, dominant chakra and ties from an (n, 7) array of chakra + vowel counts
+def score_histograms(hist, dtype=np.int32):
+    counts = hist[:, :vowel_id]
+    max_count = counts.max(axis=1)
+    vowel_count = hist[:, vowel_id]
+    dominant = np.where(max_count > 0, counts.argmax(axis=1), np.where(vowel_count > 0, chakra_ids['Vishuddha'], -1))
+    ties = ((counts == max_count[:, None]) & (max_count > 0)[:, None]) @ (1 << np.arange(vowel_id))
+
+    matrix = np.zeros((len(hist), len(score_columns)), dtype=dtype)
+    matrix[:, :vowel_id + 1] = hist
+    matrix[:, max_column] = max_count
+    matrix[:, dominant_column] = dominant
+    matrix[:, ties_column] = ties
+    return matrix
+
+# Expand one score matrix row into the count/dominant fields of chakra_engine.score_itrans
+def row_summary(row):
+    dominant = int(row[dominant_column])
+    return {
+        'chakra_counts': {chakra: int(row[i]) for i, chakra in enumerate(chakra_order)},
+        'vowel_count': int(row[vowel_id]),
+        'max_count': int(row[max_column]),
+        'dominant_chakras': [chakra for i, chakra in enumerate(chakra_order) if row[ties_column] >> i & 1],
+        'dominant_chakra': chakra_order[dominant] if dominant >= 0 else None,
+    }
+
+# Transliterate a batch of names. Returns the status of every name that cannot be scored
+# ('empty', 'error' or 'invalid_devanagari'; None for the rest), the Devanagari form of
+# each name, and the indices and ITRANS strings of the names to score.
+def prepare_batch(names, scheme="ITRANS", english_mode=False, devanagari=False):
+    statuses = [None] * len(names)
+    devanagari_names = [''] * len(names)
+    scored, itrans_names = [], []
+    for i, name in enumerate(names):
+        if not name.strip():
+            statuses[i] = 'empty'
+            continue
+        try:
+            prepared = prepare_name(name, scheme, english_mode, devanagari)
+        except Exception:
+            statuses[i] = 'error'
+            continue
+        if prepared is None:
+            statuses[i] = 'invalid_devanagari'
+            devanagari_names[i] = name
+            continue
+        devanagari_names[i] = prepared[0]
+        scored.append(i)
+        itrans_names.append(prepared[1])
+    return statuses, devanagari_names, scored, itrans_names
+
+# Analyse a batch of names with the same options. Returns one result per name with the
+# count/dominant fields of chakra_engine.score_itrans plus 'devanagari' and 'status'
+# ('ok', 'no_phonemes', 'invalid_devanagari', 'empty' or 'error'). Without prose the
+# whole batch is scored in one vectorized pass.
+def analyze_batch(names, scheme="ITRANS", english_mode=False, devanagari=False, with_prose=False):
+    if with_prose:
+        results = []
+        for name in names:
+            if not name.strip():
+                results.append({'status': 'empty'})
+                continue
+            try:
+                results.append(analyze_name(name, scheme, english_mode, devanagari))
+            except Exception:
+                results.append({'status': 'error'})
+        return results
+    with timed('batch_transliterate'):
+        statuses, devanagari_names, scored, itrans_names = prepare_batch(names, scheme, english_mode, devanagari)
+    with timed('batch_score'):
+        scores = score_batch(itrans_names)
+    results = [{'status': status} for status in statuses]
+    for i in range(len(names)):
+        if statuses[i] == 'invalid_devanagari':
+            results[i]['devanagari'] = devanagari_names[i]
+    for i, row in zip(scored, scores):
+        result = row_summary(row)
+        result['devanagari'] = devanagari_names[i]
+        result['status'] = 'ok' if result['max_count'] or result['vowel_count'] else 'no_phonemes'
+        results[i] = result
+    return results
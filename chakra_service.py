@@ -0,0 +1,283 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from chakra_engine import scheme_map
+from chakra_scoring import analyze_batch
+from chakra_detect import analyze_auto_batch
+import chakra_metrics
+from chakra_metrics import timed, prometheus_text, snapshot, snapshot_delta, merge
+
+# Run fn in a worker process, returning its result and the metrics it recorded there
+# (None unless CHAKRA_METRICS is set), for the parent to merge into its own /metrics
+def run_measured(fn, *args):
+    if not chakra_metrics.enabled:
+        return fn(*args), None
+    before = snapshot()
+    result = fn(*args)
+    return result, snapshot_delta(before, snapshot())
+
+# Raised when the service has more names queued than it is allowed to hold
+class Overloaded(Exception):
+    pass
+
+# Collects names from concurrent requests and analyses them together: requests are
+# grouped by their options and each group is scored with one analyze_batch call in
+# the worker pool. At most max_inflight batches run at once and at most max_pending
+# names wait in the queue; beyond that submit() raises Overloaded.
+class MicroBatcher:
+    def __init__(self, executor, max_batch=256, max_delay=0.005, max_pending=10000, max_inflight=4):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.inflight = asyncio.Semaphore(max_inflight)
+        self.queue = []
+        self.pending = 0
+        self.wakeup = asyncio.Event()
+        # Running dispatch tasks, referenced until they finish so they are not garbage collected
+        self.tasks = set()
+        self.stats = {'requests': 0, 'names': 0, 'batches': 0, 'rejected': 0}
+
+    async def submit(self, names, options):
+        if self.pending + len(names) > self.max_pending:
+            self.stats['rejected'] += 1
+            raise Overloaded()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.append((names, options, future))
+        self.pending += len(names)
+        self.stats['requests'] += 1
+        self.stats['names'] += len(names)
+        self.wakeup.set()
+        return await future
+
+    async def run(self):
+        while True:
+            await self.wakeup.wait()
+            # Give concurrent requests a moment to join the batch unless it is already full
+            if self.pending < self.max_batch:
+                await asyncio.sleep(self.max_delay)
+            await self.inflight.acquire()
+            items, size = [], 0
+            while self.queue and (not items or size + len(self.queue[0][0]) <= self.max_batch):
+                item = self.queue.pop(0)
+                items.append(item)
+                size += len(item[0])
+            self.pending -= size
+            if not self.queue:
+                self.wakeup.clear()
+            task = asyncio.create_task(self.dispatch(items))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def dispatch(self, items):
+        try:
+            groups = defaultdict(list)
+            for item in items:
+                groups[item[1]].append(item)
+            loop = asyncio.get_running_loop()
+            for (scheme, english_mode, devanagari, with_prose), group in groups.items():
+                names = [name for item in group for name in item[0]]
+                self.stats['batches'] += 1
+                try:
+                    with timed('service_batch'):
+                        if scheme == 'auto':
+                            results, metrics = await loop.run_in_executor(self.executor, run_measured, analyze_auto_batch, names, with_prose)
+                        else:
+                            results, metrics = await loop.run_in_executor(self.executor, run_measured, analyze_batch, names, scheme, english_mode, devanagari, with_prose)
+                    if metrics:
+                        merge(metrics)
+                except Exception as e:
+                    for _, _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                start = 0
+                for item_names, _, future in group:
+                    if not future.done():
+                        future.set_result(results[start:start + len(item_names)])
+                    start += len(item_names)
+        finally:
+            self.inflight.release()
+
+# JSON form of one analysis result
+def json_result(name, result):
+    payload = {
+        'input': name,
+        'devanagari': result.get('devanagari'),
+        'status': result['status'],
+        'chakra_counts': result.get('chakra_counts'),
+        'vowel_count': result.get('vowel_count'),
+        'dominant_chakra': result.get('dominant_chakra'),
+        'dominant_chakras': result.get('dominant_chakras'),
+    }
+    if 'prose' in result:
+        payload['prose'] = result['prose']
+    if 'detected' in result:
+        payload['detected'] = result['detected']
+    return payload
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+# Analysis options from a query string or JSON body, as a hashable batching key.
+# scheme 'auto' detects the scheme and English mode of each name (chakra_detect).
+def parse_options(params):
+    scheme = params.get('scheme', "ITRANS")
+    if not isinstance(scheme, str):
+        raise ValueError("'scheme' must be a string.")
+    if scheme == 'auto':
+        return (scheme, False, False, parse_bool(params.get('prose', False)))
+    if scheme not in scheme_map:
+        raise ValueError(f"Unknown scheme '{scheme}'. Choose one of: {', '.join(scheme_map)}, auto.")
+    return (scheme, parse_bool(params.get('english', False)), parse_bool(params.get('devanagari', False)), parse_bool(params.get('prose', False)))
+
+class AnalysisService:
+    def __init__(self, batcher, max_batch_names=10000, max_body=1 << 20):
+        self.batcher = batcher
+        self.max_batch_names = max_batch_names
+        self.max_body = max_body
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/health' and method == 'GET':
+            return 200, dict(self.batcher.stats, pending=self.batcher.pending)
+        if url.path == '/metrics' and method == 'GET':
+            counters = {f"service_{key}": value for key, value in self.batcher.stats.items()}
+            return 200, prometheus_text(counters)
+        if url.path not in ('/analyze', '/analyze/batch'):
+            return 404, {'error': "Not found."}
+        if method == 'GET' and url.path == '/analyze':
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        elif method == 'POST':
+            try:
+                params = json.loads(body or b'{}')
+            except ValueError:
+                return 400, {'error': "Request body must be JSON."}
+            if not isinstance(params, dict):
+                return 400, {'error': "Request body must be a JSON object."}
+        else:
+            return 405, {'error': "Method not allowed."}
+        try:
+            options = parse_options(params)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        if url.path == '/analyze':
+            if params.get('name') is None:
+                return 400, {'error': "'name' is required."}
+            names = [params.get('name')]
+        else:
+            names = params.get('names')
+            if not isinstance(names, list):
+                return 400, {'error': "'names' must be a list of strings."}
+            if len(names) > self.max_batch_names:
+                return 413, {'error': f"At most {self.max_batch_names} names per batch."}
+        if not all(isinstance(name, str) for name in names):
+            return 400, {'error': "Names must be strings."}
+        try:
+            results = await self.batcher.submit(names, options)
+        except Overloaded:
+            return 503, {'error': "Service overloaded, retry later."}
+        except Exception as e:
+            # e.g. BrokenProcessPool after a worker died; the client still gets an answer
+            print(f"Analysis failed: {e!r}", file=sys.stderr)
+            return 500, {'error': "Analysis failed."}
+        payload = [json_result(name, result) for name, result in zip(names, results)]
+        if url.path == '/analyze':
+            return 200, payload[0]
+        return 200, {'results': payload}
+
+    # Minimal HTTP/1.1 handling with keep-alive
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > self.max_body:
+                    await self.respond(writer, 413, {'error': "Request body too large."}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.route(method, target, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+        # Plain-text payloads (Prometheus metrics) are sent as-is, everything else as JSON
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), "application/json; charset=utf-8"
+        headers = [
+            f"HTTP/1.1 {status} {reasons[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+# Start method for the worker processes: forkserver where available (not on Windows), else spawn
+def worker_context():
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+async def serve_forever(args):
+    # Stop cleanly on SIGINT/SIGTERM so the worker processes are shut down with the server
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    # Workers start on the first analysis; forked then, they would inherit the open client
+    # sockets and keep those connections from closing, so they come from a forkserver
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=worker_context()) as executor:
+        batcher = MicroBatcher(executor, args.max_batch, args.max_delay_ms / 1000, args.max_pending, max_inflight=args.workers * 2)
+        service = AnalysisService(batcher, max_batch_names=args.max_pending)
+        batcher_task = asyncio.create_task(batcher.run())
+        server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+        print(f"Serving name analysis on http://{args.host}:{args.port} with {args.workers} workers", file=sys.stderr)
+        async with server:
+            await stop.wait()
+        batcher_task.cancel()
+
+def serve(args):
+    try:
+        asyncio.run(serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+def add_serve_arguments(parser):
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind.")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes for transliteration and scoring.")
+    parser.add_argument('--max-batch', type=int, default=256, help="Most names combined into one scoring call.")
+    parser.add_argument('--max-delay-ms', type=float, default=5, help="How long to wait for more requests before scoring a partial batch.")
+    parser.add_argument('--max-pending', type=int, default=10000, help="Most names allowed to wait; further requests get 503.")
@@ -0,0 +1,110 @@
+import codecs
+import re
+import numpy as np
+from chakra_engine import prepare_name
+from chakra_scoring import score_batch, score_histograms, row_summary, vowel_id
+
+# Characters after which a long line may be cut without changing the analysis: phonemes
+# never span whitespace, and transliteration treats it as a word boundary
+_whitespace_re = re.compile(r'\s')
+# Verse endings: a double danda in Devanagari or ITRANS
+verse_end_marks = ('॥', '||')
+
+# Read a text file or binary upload in chunks of decoded text
+def read_text_chunks(source, chunk_size=1 << 16):
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+# Split a stream of chunks into (piece, ends_line) pairs. The unfinished tail of a chunk is
+# carried over to the next one, so no phoneme or akshara is split at a chunk boundary.
+# Lines longer than max_piece are cut after their last whitespace within the limit.
+def split_lines(chunks, max_piece=1 << 16):
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line.rstrip('\r'), True
+        while len(pending) > max_piece:
+            cut = max_piece
+            for match in _whitespace_re.finditer(pending, max_piece // 2, max_piece):
+                cut = match.end()
+            yield pending[:cut], False
+            pending = pending[cut:]
+    if pending:
+        yield pending.rstrip('\r'), True
+
+# Score pieces in batches; yields (piece, ends_line, histogram) with a 7-count histogram
+# (chakra_order + vowels). Devanagari-mode pieces without Devanagari score as zero.
+def score_pieces(pieces, scheme="ITRANS", english_mode=False, devanagari=False, batch_size=512):
+    batch = []
+
+    def flush():
+        itrans = []
+        for piece, _ in batch:
+            try:
+                prepared = prepare_name(piece, scheme, english_mode, devanagari) if piece.strip() else None
+            except Exception:
+                prepared = None
+            itrans.append(prepared[1] if prepared else '')
+        scores = score_batch(itrans)
+        for (piece, ends_line), row in zip(batch, scores):
+            yield piece, ends_line, row[:vowel_id + 1]
+
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) == batch_size:
+            yield from flush()
+            batch = []
+    if batch:
+        yield from flush()
+
+# Count/dominant summary of a 7-count histogram, in the form of chakra_scoring.row_summary
+def summarize(hist):
+    return row_summary(score_histograms(np.asarray(hist, dtype=np.int64)[None, :], dtype=np.int64)[0])
+
+# Analyse a long text given as chunks in constant memory. Keeps running totals in `totals`
+# (a 7-count int64 array, allocated if not given) and yields one profile per segment:
+# per='line' for every non-blank line, per='verse' for runs of lines ended by a blank
+# line or a double danda, per=None for no profiles. Profiles carry the count/dominant
+# fields of row_summary plus segment number, first/last line and a text preview.
+def stream_profiles(chunks, scheme="ITRANS", english_mode=False, devanagari=False, per='line', totals=None, preview=80):
+    if totals is None:
+        totals = np.zeros(vowel_id + 1, dtype=np.int64)
+    segment = np.zeros(vowel_id + 1, dtype=np.int64)
+    text, line_no, start_line, index = '', 0, 1, 0
+    for piece, ends_line, hist in score_pieces(split_lines(chunks), scheme, english_mode, devanagari):
+        totals += hist
+        if per is None:
+            continue
+        segment += hist
+        # Short preview of the segment's text, lines joined by spaces
+        if len(text) < preview and (text or piece.strip()):
+            text = (text + piece + (' ' if ends_line else ''))[:preview]
+        if not ends_line:
+            continue
+        line_no += 1
+        stripped = piece.strip()
+        if per == 'verse' and stripped and not stripped.endswith(verse_end_marks):
+            continue
+        if text:
+            index += 1
+            yield dict(summarize(segment), segment=index, start_line=start_line, end_line=line_no, text=text.strip())
+        segment[:] = 0
+        text, start_line = '', line_no + 1
+    if text:
+        index += 1
+        yield dict(summarize(segment), segment=index, start_line=start_line, end_line=line_no, text=text.strip())